@@ -0,0 +1,159 @@
+"""Synthetic inputs for the grading benchmarks."""
+
+from __future__ import annotations
+
+import shutil
+import struct
+import subprocess
+import zlib
+from pathlib import Path
+from typing import Optional, Tuple
+
+# Megapixel targets mapped to 4:3 frame sizes.
+SIZES = {
+    12: (4000, 3000),
+    48: (8000, 6000),
+    200: (16320, 12240),
+}
+
+
+def frame_size(megapixels: int) -> Tuple[int, int]:
+    return SIZES[megapixels]
+
+
+def write_png(path: Path, width: int, height: int) -> Path:
+    """Write a gradient PNG row by row so 200 MP inputs stay cheap to build."""
+
+    if path.exists():
+        return path
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    compressor = zlib.compressobj(1)
+    with tmp.open("wb") as fh:
+        fh.write(b"\x89PNG\r\n\x1a\n")
+        _png_chunk(fh, b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+        base = bytes((x * 255 // max(width - 1, 1)) for x in range(width))
+        for y in range(height):
+            shade = y * 255 // max(height - 1, 1)
+            row = bytearray(width * 3)
+            row[0::3] = base
+            row[1::3] = bytes([shade]) * width
+            row[2::3] = base[::-1]
+            data = compressor.compress(b"\x00" + bytes(row))
+            if data:
+                _png_chunk(fh, b"IDAT", data)
+        _png_chunk(fh, b"IDAT", compressor.flush())
+        _png_chunk(fh, b"IEND", b"")
+    tmp.replace(path)
+    return path
+
+
+def write_jpeg(path: Path, width: int, height: int, ffmpeg: str = "ffmpeg") -> Optional[Path]:
+    """Render a test pattern JPEG with ffmpeg, or return None without it."""
+
+    if path.exists():
+        return path
+    if shutil.which(ffmpeg) is None:
+        return None
+    path.parent.mkdir(parents=True, exist_ok=True)
+    subprocess.run(
+        [
+            ffmpeg, "-v", "error", "-y",
+            "-f", "lavfi", "-i", f"testsrc2=size={width}x{height}:rate=1",
+            "-frames:v", "1", "-q:v", "3", str(path),
+        ],
+        check=True,
+    )
+    return path
+
+
+def write_exif_heavy_jpeg(path: Path, width: int = 8064, height: int = 6048, filler_tags: int = 200) -> Path:
+    """Write a header-only JPEG with a large EXIF block ahead of SOF.
+
+    The file is not decodable; it exercises the header parsers the same way
+    a drone JPEG with maker notes and XMP does.
+    """
+
+    if path.exists():
+        return path
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tiff = _build_tiff(filler_tags)
+    exif = b"Exif\x00\x00" + tiff
+    xmp = b"http://ns.adobe.com/xap/1.0/\x00" + b" " * 40_000
+    sof = struct.pack(">BHHB", 8, height, width, 3) + b"\x01\x22\x00\x02\x11\x01\x03\x11\x01"
+    with path.open("wb") as fh:
+        fh.write(b"\xFF\xD8")
+        fh.write(_segment(0xE0, b"JFIF\x00\x01\x01\x00\x00\x01\x00\x01\x00\x00"))
+        fh.write(_segment(0xE1, exif))
+        fh.write(_segment(0xE1, xmp))
+        fh.write(_segment(0xC0, sof))
+        fh.write(_segment(0xDA, b"\x03\x01\x00\x02\x11\x03\x11\x00\x3F\x00"))
+        fh.write(b"\x00" * 1024 + b"\xFF\xD9")
+    return path
+
+
+def touch_files(folder: Path, count: int, pattern: str) -> Path:
+    """Create ``count`` empty files named by ``pattern.format(i)``."""
+
+    folder.mkdir(parents=True, exist_ok=True)
+    marker = folder / f".count-{count}"
+    if marker.exists():
+        return folder
+    for idx in range(count):
+        (folder / pattern.format(idx)).touch()
+    marker.touch()
+    return folder
+
+
+def _build_tiff(filler_tags: int) -> bytes:
+    # Little-endian TIFF: IFD0 (orientation, model, GPS pointer, fillers),
+    # then the GPS IFD, then every out-of-line value.
+    entries = []
+    heap = bytearray()
+    ifd0_count = 3 + filler_tags
+    ifd0_size = 2 + ifd0_count * 12 + 4
+    gps_count = 4
+    gps_offset = 8 + ifd0_size
+    heap_offset = gps_offset + 2 + gps_count * 12 + 4
+
+    def out_of_line(data: bytes) -> int:
+        offset = heap_offset + len(heap)
+        heap.extend(data)
+        if len(heap) % 2:
+            heap.append(0)
+        return offset
+
+    model = b"FC9313\x00"
+    entries.append(struct.pack("<HHII", 0x0110, 2, len(model), out_of_line(model)))
+    entries.append(struct.pack("<HHIHH", 0x0112, 3, 1, 1, 0))
+    entries.append(struct.pack("<HHII", 0x8825, 4, 1, gps_offset))
+    for idx in range(filler_tags):
+        text = f"benchmark filler tag {idx:04d} ".encode("ascii") * 4 + b"\x00"
+        entries.append(struct.pack("<HHII", 0xC000 + idx, 2, len(text), out_of_line(text)))
+    entries.sort(key=lambda entry: struct.unpack_from("<H", entry)[0])
+
+    lat = struct.pack("<6I", 59, 1, 54, 1, 3012, 100)
+    lon = struct.pack("<6I", 10, 1, 44, 1, 2210, 100)
+    gps_entries = [
+        struct.pack("<HHI4s", 0x0001, 2, 2, b"N\x00\x00\x00"),
+        struct.pack("<HHII", 0x0002, 5, 3, out_of_line(lat)),
+        struct.pack("<HHI4s", 0x0003, 2, 2, b"E\x00\x00\x00"),
+        struct.pack("<HHII", 0x0004, 5, 3, out_of_line(lon)),
+    ]
+
+    blob = bytearray(b"II*\x00" + struct.pack("<I", 8))
+    blob += struct.pack("<H", ifd0_count) + b"".join(entries) + struct.pack("<I", 0)
+    blob += struct.pack("<H", gps_count) + b"".join(gps_entries) + struct.pack("<I", 0)
+    blob += heap
+    return bytes(blob)
+
+
+def _segment(marker: int, payload: bytes) -> bytes:
+    return bytes([0xFF, marker]) + struct.pack(">H", len(payload) + 2) + payload
+
+
+def _png_chunk(fh, kind: bytes, data: bytes) -> None:
+    fh.write(struct.pack(">I", len(data)))
+    fh.write(kind)
+    fh.write(data)
+    fh.write(struct.pack(">I", zlib.crc32(kind + data) & 0xFFFFFFFF))
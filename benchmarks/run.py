@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+"""Time the grading pipeline and compare against a stored baseline.
+
+Usage:
+    python benchmarks/run.py                      # run, write results.json
+    python benchmarks/run.py --save-baseline      # also store as baseline
+    python benchmarks/run.py --sizes 12 48        # skip the 200 MP inputs
+
+Exits non-zero when any case is slower than the baseline by more than
+``--threshold``, or when CLI startup exceeds ``--startup-budget-ms``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+BENCH_DIR = Path(__file__).resolve().parent
+ROOT = BENCH_DIR.parent
+sys.path.insert(0, str(ROOT / "src"))
+sys.path.insert(0, str(BENCH_DIR))
+
+import fixtures  # noqa: E402
+from pipeline import (  # noqa: E402
+    Grader,
+    LutLibrary,
+    PhotoAsset,
+    ProjectPaths,
+    build_manifest,
+    extract_camera_model,
+    extract_gps,
+    extract_orientation,
+    find_new_photos,
+    write_manifest,
+)
+
+DEFAULT_RESULTS = BENCH_DIR / "results.json"
+DEFAULT_BASELINE = BENCH_DIR / "baseline.json"
+DEFAULT_CACHE = BENCH_DIR / ".fixtures"
+CLI = ROOT / "src" / "cli.py"
+# CLI invocations whose startup must stay cheap; none of them touch LUTs
+# or ffmpeg, so anything above a bare interpreter is import cost.
+STARTUP_COMMANDS = {
+    "cli.startup[bare]": [],
+    "cli.startup[--help]": ["--help"],
+    "cli.startup[--stats]": ["--stats"],
+}
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Grading pipeline benchmarks")
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=sorted(fixtures.SIZES),
+        choices=sorted(fixtures.SIZES),
+        help="Megapixel sizes for the grading cases (default: all)",
+    )
+    parser.add_argument("--repeats", type=int, default=5, help="Runs per cheap case (default: 5)")
+    parser.add_argument(
+        "--files",
+        type=int,
+        default=10_000,
+        help="Directory size for the inbox scan and manifest cases (default: 10000)",
+    )
+    parser.add_argument("--filter", metavar="TEXT", help="Only run cases whose name contains TEXT")
+    parser.add_argument("--output", type=Path, default=DEFAULT_RESULTS, help="Results JSON path")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE, help="Baseline JSON path")
+    parser.add_argument(
+        "--save-baseline",
+        action="store_true",
+        help="Store this run as the new baseline",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.15,
+        help="Allowed slowdown versus baseline as a fraction (default: 0.15)",
+    )
+    parser.add_argument(
+        "--startup-budget-ms",
+        type=float,
+        default=150.0,
+        help="Max CLI startup time above a bare interpreter (default: 150)",
+    )
+    parser.add_argument("--cache", type=Path, default=DEFAULT_CACHE, help="Fixture cache directory")
+    parser.add_argument("--ffmpeg", default="ffmpeg", help="ffmpeg binary for grading cases")
+    return parser.parse_args()
+
+
+class Suite:
+    def __init__(self, name_filter: Optional[str]) -> None:
+        self._filter = name_filter
+        self.results: Dict[str, dict] = {}
+
+    def wanted(self, name: str) -> bool:
+        return not self._filter or self._filter in name
+
+    def time(self, name: str, func: Callable[[], object], repeats: int, **meta) -> None:
+        if not self.wanted(name):
+            return
+        samples: List[float] = []
+        for _ in range(max(repeats, 1)):
+            start = time.perf_counter()
+            func()
+            samples.append(time.perf_counter() - start)
+        self.results[name] = {
+            "median": statistics.median(samples),
+            "min": min(samples),
+            "max": max(samples),
+            "repeats": len(samples),
+            **meta,
+        }
+        print(f"  {name:<40} {self.results[name]['median'] * 1000:10.2f} ms")
+
+    def skip(self, name: str, reason: str) -> None:
+        if not self.wanted(name):
+            return
+        self.results[name] = {"skipped": reason}
+        print(f"  {name:<40} {'skipped':>13} ({reason})")
+
+
+def bench_grading(suite: Suite, args: argparse.Namespace, work: Path) -> None:
+    paths = ProjectPaths(root=work / "grade")
+    paths.luts.parent.mkdir(parents=True, exist_ok=True)
+    if not paths.luts.exists():
+        shutil.copytree(ROOT / "src" / "luts", paths.luts)
+    paths.inbox.mkdir(parents=True, exist_ok=True)
+    library = LutLibrary(paths.luts)
+    library.refresh()
+    lut = next(iter(library.profiles()))
+    grader = Grader(paths, ffmpeg_bin=args.ffmpeg)
+    have_ffmpeg = shutil.which(args.ffmpeg) is not None
+
+    for mp in args.sizes:
+        width, height = fixtures.frame_size(mp)
+        repeats = 1 if mp >= 100 else min(args.repeats, 3)
+        for ext in ("jpg", "png"):
+            name = f"grader.apply[{mp}mp-{ext}]"
+            if not suite.wanted(name):
+                continue
+            if not have_ffmpeg:
+                suite.skip(name, "ffmpeg not found")
+                continue
+            cached = args.cache / f"synthetic_{mp}mp.{ext}"
+            if ext == "jpg":
+                fixtures.write_jpeg(cached, width, height, ffmpeg=args.ffmpeg)
+            else:
+                fixtures.write_png(cached, width, height)
+            staged = paths.inbox / cached.name
+            if not staged.exists():
+                staged.symlink_to(cached.resolve())
+            asset = PhotoAsset(path=staged)
+            suite.time(
+                name,
+                lambda: grader.apply(asset, lut, overwrite=True),
+                repeats,
+                megapixels=width * height / 1_000_000,
+            )
+
+
+def bench_luts(suite: Suite, args: argparse.Namespace) -> None:
+    library = LutLibrary(ROOT / "src" / "luts")
+    suite.time("lut_library.refresh", library.refresh, args.repeats * 20)
+
+
+def bench_exif(suite: Suite, args: argparse.Namespace) -> None:
+    heavy = fixtures.write_exif_heavy_jpeg(args.cache / "exif_heavy.jpg")
+    repeats = args.repeats * 20
+    suite.time("exif.extract_gps", lambda: extract_gps(heavy), repeats)
+    suite.time("exif.extract_orientation", lambda: extract_orientation(heavy), repeats)
+    suite.time("exif.extract_camera_model", lambda: extract_camera_model(heavy), repeats)
+
+
+def bench_scans(suite: Suite, args: argparse.Namespace, work: Path) -> None:
+    count = args.files
+    inbox = fixtures.touch_files(work / "scan" / "inbox", count, "IMG_{:06d}.jpg")
+    suite.time(f"find_new_photos[{count}]", lambda: list(find_new_photos(inbox)), args.repeats)
+
+    paths = ProjectPaths(root=work / "manifest")
+    half = count // 2
+    fixtures.touch_files(paths.gallery / "landscape", half, "IMG_{:06d}__golden_light.jpg")
+    fixtures.touch_files(paths.gallery / "vertical", count - half, "IMG_{:06d}__ocean_blues.jpg")
+    suite.time(f"build_manifest[{count}]", lambda: build_manifest(paths), args.repeats)
+    name = f"write_manifest[{count}]"
+    if suite.wanted(name):
+        suite.time(
+            name,
+            lambda: write_manifest(paths),
+            args.repeats,
+            peak_kib=_peak_kib(lambda: write_manifest(paths)),
+        )
+
+
+def bench_startup(suite: Suite, args: argparse.Namespace, work: Path) -> List[str]:
+    """Time fresh CLI processes; return the commands over the startup budget."""
+
+    project = work / "startup"
+    project.mkdir(parents=True, exist_ok=True)
+
+    def run(argv: List[str]) -> None:
+        subprocess.run(argv, cwd=project, stdout=subprocess.DEVNULL, check=True)
+
+    repeats = max(args.repeats, 5)
+    suite.time("python.startup", lambda: run([sys.executable, "-c", "pass"]), repeats)
+    interpreter = suite.results.get("python.startup", {}).get("median", 0.0)
+    over = []
+    for name, extra in STARTUP_COMMANDS.items():
+        suite.time(name, lambda extra=extra: run([sys.executable, str(CLI), *extra]), repeats)
+        if name not in suite.results:
+            continue
+        overhead_ms = (suite.results[name]["median"] - interpreter) * 1000
+        suite.results[name]["overhead_ms"] = overhead_ms
+        if overhead_ms > args.startup_budget_ms:
+            over.append(name)
+    return over
+
+
+def _peak_kib(func: Callable[[], object]) -> int:
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1] // 1024
+    finally:
+        tracemalloc.stop()
+
+
+def compare(results: Dict[str, dict], baseline: Dict[str, dict], threshold: float) -> List[str]:
+    regressions = []
+    print("\nVersus baseline:")
+    for name, current in sorted(results.items()):
+        before = baseline.get(name)
+        if not before or "median" not in before or "median" not in current:
+            continue
+        ratio = current["median"] / before["median"] if before["median"] else 1.0
+        flag = ""
+        if ratio > 1.0 + threshold:
+            flag = "  REGRESSION"
+            regressions.append(name)
+        print(f"  {name:<40} {ratio:6.2f}x{flag}")
+    return regressions
+
+
+def main() -> int:
+    args = parse_args()
+    args.cache.mkdir(parents=True, exist_ok=True)
+    suite = Suite(args.filter)
+
+    print("Running benchmarks:")
+    with tempfile.TemporaryDirectory(prefix="vclip-bench-") as tmp:
+        work = Path(tmp)
+        over_budget = bench_startup(suite, args, work)
+        bench_luts(suite, args)
+        bench_exif(suite, args)
+        bench_scans(suite, args, args.cache)
+        bench_grading(suite, args, work)
+
+    report = {
+        "generated_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": suite.results,
+    }
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(report, indent=2))
+    print(f"\nWrote results: {args.output}")
+
+    regressions: List[str] = []
+    if args.baseline.exists():
+        baseline = json.loads(args.baseline.read_text()).get("results", {})
+        regressions = compare(suite.results, baseline, args.threshold)
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(report, indent=2))
+        print(f"Saved baseline: {args.baseline}")
+
+    failed = False
+    if over_budget:
+        print(f"\nCLI startup over the {args.startup_budget_ms:.0f} ms budget: {', '.join(over_budget)}")
+        failed = True
+    if regressions:
+        print(f"\n{len(regressions)} case(s) regressed beyond {args.threshold:.0%}")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,12 +5,13 @@ ROOT="$(cd "$(dirname "${BASH_SOURCE[0]}")/.." && pwd)"
 DIST="$ROOT/dist"
 GALLERY_SRC="$ROOT/src/photos/gallery"
 DATA_SRC="$ROOT/src/data/gallery.json"
+SHARDS_SRC="$ROOT/src/data/gallery"
 
 # Ensure manifest is current
 PYTHONPATH="$ROOT/src" python3 "$ROOT/src/cli.py" --build-manifest >/dev/null
 
 rm -rf "$DIST"
-mkdir -p "$DIST/gallery/landscape" "$DIST/gallery/vertical" "$DIST/data"
+mkdir -p "$DIST/gallery/landscape" "$DIST/gallery/vertical" "$DIST/data/gallery"
 
 cp "$ROOT/web/index.html" "$DIST/"
 cp "$ROOT/web/styles.css" "$DIST/"
@@ -18,6 +19,9 @@ cp "$ROOT/web/app.js" "$DIST/"
 cp "$DATA_SRC" "$DIST/data/"
 
 shopt -s nullglob
+for file in "$SHARDS_SRC"/*.json; do
+  cp "$file" "$DIST/data/gallery/"
+done
 for file in "$GALLERY_SRC"/landscape/*.jpg; do
   cp "$file" "$DIST/gallery/landscape/"
 done
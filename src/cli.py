@@ -4,21 +4,15 @@
 from __future__ import annotations
 
 import argparse
-import functools
-import http.server
-import socketserver
-import subprocess
+import time
 from pathlib import Path
+from typing import TYPE_CHECKING, Tuple
 
-from pipeline import (
-    Grader,
-    LutLibrary,
-    ProjectPaths,
-    build_manifest,
-    extract_gps,
-    find_new_photos,
-    write_manifest,
-)
+# Only the path helpers load eagerly; each command imports what it uses.
+from pipeline.config import ProjectPaths
+
+if TYPE_CHECKING:  # pragma: no cover - annotations only
+    from pipeline.lut import LutLibrary
 
 
 def parse_args() -> argparse.Namespace:
@@ -49,6 +43,22 @@ def parse_args() -> argparse.Namespace:
         metavar="LUT",
         help="Name of the LUT to apply when using --grade",
     )
+    parser.add_argument(
+        "--rank",
+        metavar="PHOTO",
+        help="Score every LUT on a tiny proxy of PHOTO and print a shortlist",
+    )
+    parser.add_argument(
+        "--top",
+        type=int,
+        default=3,
+        help="Shortlist size for --rank (default: 3)",
+    )
+    parser.add_argument(
+        "--grade-top",
+        action="store_true",
+        help="With --rank, grade the shortlisted LUTs at full resolution",
+    )
     parser.add_argument(
         "--no-overwrite",
         action="store_true",
@@ -59,21 +69,92 @@ def parse_args() -> argparse.Namespace:
         action="store_true",
         help="Write gallery manifest JSON",
     )
+    parser.add_argument(
+        "--stats",
+        action="store_true",
+        help="Report latency and throughput from the grading history",
+    )
+    parser.add_argument(
+        "--since-days",
+        type=float,
+        metavar="DAYS",
+        default=None,
+        help="Limit --stats to the last DAYS days",
+    )
+    parser.add_argument(
+        "--gc",
+        action="store_true",
+        help="Delete processed/gallery outputs whose source photo or LUT is gone",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="With --gc, only report what would be deleted",
+    )
     parser.add_argument(
         "--serve",
         action="store_true",
         help="Serve static gallery preview on localhost",
     )
+    parser.add_argument(
+        "--rebuild",
+        action="store_true",
+        help="With --serve, run scripts/build.sh even if dist/ is up to date",
+    )
+    parser.add_argument(
+        "--api",
+        action="store_true",
+        help="Run the local grading HTTP API backed by a worker pool",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Grading workers for --api (default: CPU count)",
+    )
+    parser.add_argument(
+        "--memory-budget",
+        type=int,
+        metavar="MB",
+        default=None,
+        help="Cap the estimated memory of concurrent --api grades",
+    )
+    parser.add_argument(
+        "--gallery-aspect",
+        type=_parse_aspect,
+        metavar="W:H",
+        default=None,
+        help="Crop gallery renditions to this aspect, e.g. 16:9 (verticals get 9:16)",
+    )
+    parser.add_argument(
+        "--trace",
+        type=Path,
+        metavar="PATH",
+        default=None,
+        help="Write per-stage timings as Chrome trace JSON (--grade, --api)",
+    )
     parser.add_argument(
         "--port",
         type=int,
-        default=8000,
-        help="Port to use with --serve (default: 8000)",
+        default=None,
+        help="Port to use with --serve (default: 8000) or --api (default: 8001)",
     )
     return parser.parse_args()
 
 
+def _load_library(paths: ProjectPaths) -> LutLibrary:
+    from pipeline.lut import LutLibrary
+
+    library = LutLibrary(paths.luts)
+    library.ensure()
+    library.refresh()
+    return library
+
+
 def list_state(paths: ProjectPaths, library: LutLibrary, show_details: bool = False) -> None:
+    from pipeline.exif import extract_gps
+    from pipeline.ingest import find_new_photos
+
     photos = list(find_new_photos(paths.inbox))
 
     print("Staged photos:")
@@ -122,26 +203,64 @@ def list_state(paths: ProjectPaths, library: LutLibrary, show_details: bool = Fa
 def main() -> None:
     args = parse_args()
     paths = ProjectPaths.from_env(args.project_root)
-    library = LutLibrary(paths.luts)
-    library.ensure()
-    library.refresh()
 
     if args.grade:
         if not args.lut:
             raise SystemExit("error: --grade requires --lut to be specified")
-        grade_photo(paths, library, args.grade, args.lut, overwrite=not args.no_overwrite)
+        grade_photo(
+            paths,
+            _load_library(paths),
+            args.grade,
+            args.lut,
+            overwrite=not args.no_overwrite,
+            trace_path=args.trace,
+            gallery_aspect=args.gallery_aspect,
+        )
+        return
+
+    if args.rank:
+        rank_photo(
+            paths,
+            _load_library(paths),
+            args.rank,
+            top=args.top,
+            grade=args.grade_top,
+            overwrite=not args.no_overwrite,
+            gallery_aspect=args.gallery_aspect,
+        )
+        return
+
+    if args.gc:
+        collect_garbage(paths, _load_library(paths), dry_run=args.dry_run)
+        return
+
+    if args.stats:
+        print_stats(paths, since_days=args.since_days)
         return
 
     if args.build_manifest:
+        from pipeline.gallery import write_manifest
+
         out = write_manifest(paths)
         print(f"Wrote manifest: {out}")
 
+    if args.api:
+        serve_api(
+            paths,
+            port=args.port or 8001,
+            workers=args.workers,
+            memory_budget_mb=args.memory_budget,
+            trace_path=args.trace,
+            gallery_aspect=args.gallery_aspect,
+        )
+        return
+
     if args.serve:
-        serve_gallery(paths, port=args.port)
+        serve_gallery(paths, port=args.port or 8000, rebuild=args.rebuild)
         return
 
     if args.list:
-        list_state(paths, library, show_details=args.details)
+        list_state(paths, _load_library(paths), show_details=args.details)
         return
 
     print("Prototype CLI ready. Use --list to view staged assets.")
@@ -153,7 +272,14 @@ def grade_photo(
     photo_name: str,
     lut_name: str,
     overwrite: bool,
+    trace_path: Path | None = None,
+    gallery_aspect: Tuple[int, int] | None = None,
 ) -> None:
+    from pipeline.grade import Grader
+    from pipeline.history import GradeHistory
+    from pipeline.ingest import find_new_photos
+    from pipeline.trace import Tracer
+
     photos = {asset.path.name: asset for asset in find_new_photos(paths.inbox)}
     asset = _resolve_case_insensitive(photos, photo_name)
     if asset is None:
@@ -164,11 +290,20 @@ def grade_photo(
     if lut is None:
         raise SystemExit(f"error: LUT '{lut_name}' not found")
 
-    grader = Grader(paths)
+    tracer = Tracer() if trace_path else None
+    grader = Grader(
+        paths,
+        tracer=tracer,
+        history=GradeHistory(paths.history),
+        gallery_aspect=gallery_aspect,
+    )
     try:
         result = grader.apply(asset, lut, overwrite=overwrite)
     except FileExistsError as err:
         raise SystemExit(f"error: target exists: {err}")
+    finally:
+        if tracer is not None:
+            tracer.write_chrome_trace(trace_path)
 
     print("Graded photo:")
     print(f"  source:    {asset.path}")
@@ -181,19 +316,139 @@ def grade_photo(
         f"  gallery:   {result.gallery_path}"
         f"  [{result.gallery_seconds:.2f}s]"
     )
-    print(f"  total:     {result.total_seconds:.2f}s")
+    print(f"  total:     {result.total_seconds:.2f}s  ({result.backend})")
+    if trace_path:
+        print(f"  trace:     {trace_path}")
 
 
-def serve_gallery(paths: ProjectPaths, port: int = 8000) -> None:
+def rank_photo(
+    paths: ProjectPaths,
+    library: LutLibrary,
+    photo_name: str,
+    top: int = 3,
+    grade: bool = False,
+    overwrite: bool = True,
+    gallery_aspect: Tuple[int, int] | None = None,
+) -> None:
+    from pipeline.ingest import find_new_photos
+    from pipeline.rank import rank_luts
+
+    photos = {asset.path.name: asset for asset in find_new_photos(paths.inbox)}
+    asset = _resolve_case_insensitive(photos, photo_name)
+    if asset is None:
+        raise SystemExit(f"error: photo '{photo_name}' not found in inbox")
+    profiles = list(library.profiles())
+    if not profiles:
+        raise SystemExit(f"error: no LUTs found in {paths.luts}")
+    try:
+        ranking = rank_luts(asset, profiles)
+    except (RuntimeError, ValueError) as err:
+        raise SystemExit(f"error: {err}")
+
+    print(f"LUT shortlist for {asset.path.name}:")
+    print(
+        f"  proxy: {ranking.proxy_source}, {ranking.proxy_pixels} px"
+        f"  [decode {ranking.decode_seconds * 1000:.1f} ms,"
+        f" rank {ranking.rank_seconds * 1000:.1f} ms]"
+    )
+    for idx, score in enumerate(ranking.scores, start=1):
+        marker = "*" if idx <= top else " "
+        print(
+            f"  {marker}{idx:>2}. {score.name:<20} score {score.score:+.3f}"
+            f"  (contrast {score.contrast:.3f}, saturation {score.saturation:.3f},"
+            f" clipped {score.clipping:.1%})"
+        )
+
+    if grade:
+        for score in ranking.top(top):
+            grade_photo(
+                paths,
+                library,
+                asset.path.name,
+                score.name,
+                overwrite=overwrite,
+                gallery_aspect=gallery_aspect,
+            )
+
+
+def collect_garbage(paths: ProjectPaths, library: LutLibrary, dry_run: bool = False) -> None:
+    from pipeline.gallery import write_manifest
+    from pipeline.prune import prune_outputs
+
+    try:
+        report = prune_outputs(paths, library, dry_run=dry_run)
+    except RuntimeError as err:
+        raise SystemExit(f"error: {err}")
+
+    verb = "Would remove" if dry_run else "Removed"
+    if not report.stale:
+        print("No stale outputs found.")
+        return
+    for item in report.stale:
+        rel = item.path.relative_to(paths.root) if paths.root in item.path.parents else item.path
+        print(f"  {_format_bytes(item.size):>9}  {rel}  ({item.reason})")
+    print(f"{verb} {len(report.stale)} file(s), {_format_bytes(report.total_bytes)}")
+    if not dry_run and report.touches_gallery(paths):
+        print(f"Wrote manifest: {write_manifest(paths)}")
+
+
+def _format_bytes(size: float) -> str:
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024 or unit == "GB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+
+def print_stats(paths: ProjectPaths, since_days: float | None = None) -> None:
+    from pipeline.history import GradeHistory, summarize
+
+    history = GradeHistory(paths.history)
+    since = time.time() - since_days * 86400 if since_days else None
+    stats = summarize(history.records(since=since))
+
+    print(f"Grading history: {history.path}")
+    print(f"  grades: {stats['total']}  failed: {stats['failed']}")
+    if stats["total"] == stats["failed"]:
+        return
+    for title, key in (("By backend", "backends"), ("By LUT", "luts"), ("Trend (UTC days)", "trend")):
+        print(f"\n{title}:")
+        print(f"  {'':<22} {'n':>5} {'p50':>8} {'p95':>8} {'MP/s':>8}")
+        for name, group in stats[key].items():
+            print(
+                f"  {name:<22} {group['count']:>5}"
+                f" {_fmt(group['p50_seconds'], 's'):>8}"
+                f" {_fmt(group['p95_seconds'], 's'):>8}"
+                f" {_fmt(group['mp_per_second']):>8}"
+            )
+
+
+def _fmt(value: float | None, unit: str = "") -> str:
+    return "-" if value is None else f"{value:.2f}{unit}"
+
+
+def serve_gallery(paths: ProjectPaths, port: int = 8000, rebuild: bool = False) -> None:
+    import functools
+    import http.server
+    import socketserver
+    import subprocess
+
     build_script = paths.root / "scripts" / "build.sh"
     serve_dir = paths.root
     if build_script.exists():
-        try:
-            subprocess.run(["bash", str(build_script)], check=True)
-            serve_dir = paths.root / "dist"
-        except subprocess.CalledProcessError as err:
-            raise SystemExit(f"error: build failed ({err.returncode})")
+        dist = paths.root / "dist"
+        if rebuild or not _dist_is_current(paths, build_script):
+            try:
+                subprocess.run(["bash", str(build_script)], check=True)
+            except subprocess.CalledProcessError as err:
+                raise SystemExit(f"error: build failed ({err.returncode})")
+            (dist / _BUILD_STAMP).touch()
+        else:
+            print("dist/ is up to date; skipping build (use --rebuild to force).")
+        serve_dir = dist
     else:
+        from pipeline.gallery import write_manifest
+
         write_manifest(paths)
         serve_dir = paths.root
 
@@ -217,6 +472,87 @@ def serve_gallery(paths: ProjectPaths, port: int = 8000) -> None:
         raise SystemExit(f"error: could not bind to port {port}: {err}")
 
 
+def serve_api(
+    paths: ProjectPaths,
+    port: int = 8001,
+    workers: int | None = None,
+    memory_budget_mb: int | None = None,
+    trace_path: Path | None = None,
+    gallery_aspect: Tuple[int, int] | None = None,
+) -> None:
+    from pipeline.grade import Grader
+    from pipeline.history import GradeHistory
+    from pipeline.service import GradingService, make_api_server
+    from pipeline.trace import Tracer
+
+    tracer = Tracer() if trace_path else None
+    service = GradingService(
+        paths,
+        workers=workers,
+        grader=Grader(
+            paths,
+            tracer=tracer,
+            history=GradeHistory(paths.history),
+            gallery_aspect=gallery_aspect,
+        ),
+        memory_budget_mb=memory_budget_mb,
+        tracer=tracer,
+    )
+    try:
+        server = make_api_server(service, port=port)
+    except OSError as err:
+        service.shutdown()
+        raise SystemExit(f"error: could not bind to port {port}: {err}")
+    try:
+        with server:
+            host, actual_port = server.server_address[:2]
+            print(f"Grading API at http://{host}:{actual_port}/jobs")
+            print("Press Ctrl+C to stop.")
+            server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nStopped.")
+    finally:
+        service.shutdown(wait=False)
+        if tracer is not None:
+            print(f"Wrote trace: {tracer.write_chrome_trace(trace_path)}")
+
+
+def _parse_aspect(text: str) -> Tuple[int, int]:
+    try:
+        width, height = (int(part) for part in text.split(":"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected W:H (e.g. 16:9), got {text!r}")
+    if width <= 0 or height <= 0:
+        raise argparse.ArgumentTypeError(f"aspect sides must be positive, got {text!r}")
+    return width, height
+
+
+_BUILD_STAMP = ".build-stamp"
+
+
+def _dist_is_current(paths: ProjectPaths, build_script: Path) -> bool:
+    """True when dist/ was built after every input build.sh copies changed."""
+
+    stamp = paths.root / "dist" / _BUILD_STAMP
+    try:
+        built = stamp.stat().st_mtime_ns
+    except OSError:
+        return False
+    inputs = [build_script, paths.root / "web", paths.gallery, paths.data]
+    # Directory mtimes catch added/removed files; file mtimes catch edits.
+    for folder in (paths.root / "web", paths.gallery / "landscape", paths.gallery / "vertical"):
+        if folder.exists():
+            inputs.append(folder)
+            inputs.extend(folder.iterdir())
+    for path in inputs:
+        try:
+            if path.stat().st_mtime_ns > built:
+                return False
+        except OSError:
+            continue
+    return True
+
+
 def _resolve_case_insensitive(mapping, key: str):
     if key in mapping:
         return mapping[key]
@@ -1,26 +1,85 @@
-"""Pipeline package for local photo grading workflow."""
-
-from .config import ProjectPaths
-from .models import PhotoAsset, LutProfile
-from .lut import LutLibrary
-from .ingest import find_new_photos
-from .grade import Grader, GradeResult
-from .gallery import GalleryEntry, build_manifest, write_manifest
-from .exif import GPSData, extract_camera_model, extract_gps, extract_orientation
-
-__all__ = [
-    "ProjectPaths",
-    "PhotoAsset",
-    "LutProfile",
-    "LutLibrary",
-    "Grader",
-    "GradeResult",
-    "GalleryEntry",
-    "build_manifest",
-    "write_manifest",
-    "GPSData",
-    "extract_camera_model",
-    "extract_gps",
-    "extract_orientation",
-    "find_new_photos",
-]
+"""Pipeline package for local photo grading workflow.
+
+Public names are resolved lazily so importing the package (or one cheap
+submodule) doesn't pay for ffmpeg, HTTP or NumPy support it won't use.
+"""
+
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING
+
+_EXPORTS = {
+    "ProjectPaths": "config",
+    "PhotoAsset": "models",
+    "LutProfile": "models",
+    "LutLibrary": "lut",
+    "Grader": "grade",
+    "GradeResult": "grade",
+    "GalleryEntry": "gallery",
+    "build_manifest": "gallery",
+    "write_manifest": "gallery",
+    "GPSData": "exif",
+    "extract_camera_model": "exif",
+    "extract_gps": "exif",
+    "extract_orientation": "exif",
+    "extract_thumbnail": "exif",
+    "PruneReport": "prune",
+    "StaleOutput": "prune",
+    "find_stale_outputs": "prune",
+    "prune_outputs": "prune",
+    "LutScore": "rank",
+    "LutStack": "rank",
+    "RankResult": "rank",
+    "rank_luts": "rank",
+    "AssetTable": "ingest",
+    "find_new_photos": "ingest",
+    "Placeholder": "placeholder",
+    "GradeHistory": "history",
+    "GradeRecord": "history",
+    "summarize": "history",
+    "FfmpegStats": "trace",
+    "Span": "trace",
+    "Tracer": "trace",
+    "parse_ffmpeg_stats": "trace",
+    "GradeJob": "service",
+    "GradingService": "service",
+    "make_api_server": "service",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
+
+
+if TYPE_CHECKING:  # pragma: no cover - static analysis only
+    from .config import ProjectPaths
+    from .exif import (
+        GPSData,
+        extract_camera_model,
+        extract_gps,
+        extract_orientation,
+        extract_thumbnail,
+    )
+    from .gallery import GalleryEntry, build_manifest, write_manifest
+    from .grade import Grader, GradeResult
+    from .history import GradeHistory, GradeRecord, summarize
+    from .ingest import AssetTable, find_new_photos
+    from .lut import LutLibrary
+    from .models import LutProfile, PhotoAsset
+    from .placeholder import Placeholder
+    from .prune import PruneReport, StaleOutput, find_stale_outputs, prune_outputs
+    from .rank import LutScore, LutStack, RankResult, rank_luts
+    from .service import GradeJob, GradingService, make_api_server
+    from .trace import FfmpegStats, Span, Tracer, parse_ffmpeg_stats
@@ -28,6 +28,10 @@ class ProjectPaths:
     def data(self) -> Path:
         return self.root / "src" / "data"
 
+    @property
+    def history(self) -> Path:
+        return self.data / "grade_history.jsonl"
+
     @classmethod
     def from_env(cls, start: Path | None = None) -> "ProjectPaths":
         base = (start or Path.cwd()).resolve()
@@ -166,6 +166,22 @@ class _ExifParser:
             return value
         return None
 
+    def thumbnail(self) -> Optional[bytes]:
+        """Embedded JPEG thumbnail referenced from IFD1, if any."""
+
+        _, ifd1_offset = self._read_ifd(self._u32(4))
+        if ifd1_offset is None:
+            return None
+        ifd1, _ = self._read_ifd(ifd1_offset)
+        offset = _first_int(ifd1.get(0x0201))
+        length = _first_int(ifd1.get(0x0202))
+        if not offset or not length or offset + length > len(self._blob):
+            return None
+        data = self._blob[offset : offset + length]
+        if not data.startswith(b"\xFF\xD8"):
+            return None
+        return data
+
     def camera_model(self) -> Optional[str]:
         value = self.ifd0().get(0x0110)
         if value is None:
@@ -185,6 +201,12 @@ class _ExifParser:
         return value
 
 
+def _first_int(value) -> Optional[int]:
+    if isinstance(value, tuple):
+        value = value[0] if value else None
+    return value if isinstance(value, int) else None
+
+
 def _rational_triplet_to_deg(values: Iterable[Tuple[int, int]], ref: str | Iterable) -> Optional[float]:
     try:
         ref_char = ref if isinstance(ref, str) else bytes(ref).decode("ascii", errors="replace")
@@ -233,6 +255,15 @@ def extract_camera_model(path: Path) -> Optional[str]:
     return parser.camera_model()
 
 
+def extract_thumbnail(path: Path) -> Optional[bytes]:
+    data = path.read_bytes()
+    exif_segment = _find_exif_segment(data)
+    if exif_segment is None:
+        return None
+    parser = _ExifParser(exif_segment)
+    return parser.thumbnail()
+
+
 def _find_exif_segment(blob: bytes) -> Optional[bytes]:
     import struct
 
@@ -264,4 +295,10 @@ def _find_exif_segment(blob: bytes) -> Optional[bytes]:
     return None
 
 
-__all__ = ["GPSData", "extract_gps", "extract_orientation", "extract_camera_model"]
+__all__ = [
+    "GPSData",
+    "extract_gps",
+    "extract_orientation",
+    "extract_camera_model",
+    "extract_thumbnail",
+]
@@ -1,64 +1,155 @@
 from __future__ import annotations
 
+import hashlib
+import itertools
 import json
+import os
+import sys
+import tempfile
 from dataclasses import dataclass, asdict
 from datetime import datetime
 from pathlib import Path
-from typing import Iterable, List
+from typing import Iterator, List, Optional, Sequence
 
 from .config import ProjectPaths
+from .naming import ORIENTATIONS, split_output_stem
+from .placeholder import read_sidecar
 
+MANIFEST_VERSION = 2
+DEFAULT_PAGE_SIZE = 100
+_SHARD_ENCODER = json.JSONEncoder(separators=(",", ":"))
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True)
 class GalleryEntry:
     orientation: str
     path: str
     source: str
     lut: str
+    placeholder: Optional[str] = None
+    color: Optional[str] = None
 
 
 def build_manifest(paths: ProjectPaths) -> dict:
-    entries = list(_collect_entries(paths))
-    return {
-        "generated_at": datetime.utcnow().isoformat(timespec="seconds") + "Z",
-        "landscape": [asdict(e) for e in entries if e.orientation == "landscape"],
-        "vertical": [asdict(e) for e in entries if e.orientation == "vertical"],
-    }
+    manifest: dict = {"generated_at": datetime.utcnow().isoformat(timespec="seconds") + "Z"}
+    for orientation in ORIENTATIONS:
+        manifest[orientation] = [asdict(e) for e in _collect_entries(paths, (orientation,))]
+    return manifest
+
 
+def write_manifest(
+    paths: ProjectPaths,
+    manifest_path: Path | None = None,
+    page_size: int = DEFAULT_PAGE_SIZE,
+) -> Path:
+    """Write a small manifest index plus immutable per-orientation shards.
+
+    Shards hold ``page_size`` entries each and are named by content hash
+    under ``<manifest stem>/`` next to the index, so clients can cache them
+    forever and only revalidate the index. Shards no longer referenced are
+    removed. Entries are read and written one page at a time, so memory
+    stays flat however large the gallery grows.
+    """
 
-def write_manifest(paths: ProjectPaths, manifest_path: Path | None = None) -> Path:
-    manifest = build_manifest(paths)
     out_path = manifest_path or (paths.data / "gallery.json")
+    shard_dir = out_path.parent / out_path.stem
+    shard_dir.mkdir(parents=True, exist_ok=True)
+
+    index = {
+        "version": MANIFEST_VERSION,
+        "generated_at": datetime.utcnow().isoformat(timespec="seconds") + "Z",
+        "page_size": page_size,
+    }
+    keep = set()
+    for orientation in ORIENTATIONS:
+        shards = []
+        total = 0
+        entries = _collect_entries(paths, (orientation,))
+        while page := list(itertools.islice(entries, page_size)):
+            name = _write_shard(shard_dir, orientation, page)
+            keep.add(name)
+            shards.append({"path": f"{shard_dir.name}/{name}", "count": len(page)})
+            total += len(page)
+        index[orientation] = {"count": total, "shards": shards}
+
+    # Swap the index in atomically before dropping old shards, so a client
+    # reading gallery.json never points at a shard that is already gone.
     out_path.parent.mkdir(parents=True, exist_ok=True)
-    out_path.write_text(json.dumps(manifest, indent=2))
+    fd, tmp = tempfile.mkstemp(dir=out_path.parent, prefix=f".{out_path.stem}-", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as fh:
+            fh.write(json.dumps(index, indent=2))
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, out_path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+    for stale in shard_dir.glob("*.json"):
+        if stale.name not in keep:
+            stale.unlink()
     return out_path
 
 
-def _collect_entries(paths: ProjectPaths) -> Iterable[GalleryEntry]:
-    gallery_root = paths.gallery
-    for orientation in ("landscape", "vertical"):
-        base_dir = gallery_root / orientation
-        if not base_dir.exists():
-            continue
-        for file in sorted(base_dir.glob("*.jpg")):
-            source, lut = _parse_name(file.name)
-            rel = Path("gallery") / orientation / file.name
+def _write_shard(shard_dir: Path, orientation: str, page: Sequence[GalleryEntry]) -> str:
+    # Stream the page to a temp file while hashing it, then move it to its
+    # content-addressed name (or drop it if that shard already exists).
+    digest = hashlib.sha256()
+    fd, tmp = tempfile.mkstemp(dir=shard_dir, prefix=f".{orientation}-", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as fh:
+            for chunk in _SHARD_ENCODER.iterencode([asdict(entry) for entry in page]):
+                digest.update(chunk.encode("utf-8"))
+                fh.write(chunk)
+        # mkstemp files are owner-only; shards are served as static files.
+        os.chmod(tmp, 0o644)
+        name = f"{orientation}-{digest.hexdigest()[:16]}.json"
+        target = shard_dir / name
+        if target.exists():
+            os.unlink(tmp)
+        else:
+            os.replace(tmp, target)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+    return name
+
+
+def _collect_entries(
+    paths: ProjectPaths, orientations: Sequence[str] = ORIENTATIONS
+) -> Iterator[GalleryEntry]:
+    for orientation in orientations:
+        base_dir = paths.gallery / orientation
+        for name in _gallery_names(base_dir):
+            source, lut = _parse_name(name)
+            lqip = read_sidecar(base_dir / name)
             yield GalleryEntry(
                 orientation=orientation,
-                path=str(rel),
+                path=f"gallery/{orientation}/{name}",
                 source=source,
                 lut=lut,
+                placeholder=lqip.data_uri if lqip else None,
+                color=lqip.color if lqip else None,
             )
 
 
+def _gallery_names(folder: Path) -> List[str]:
+    # Plain names rather than Paths: the sorted listing is the only part
+    # of the scan that grows with the gallery.
+    try:
+        with os.scandir(folder) as it:
+            return sorted(entry.name for entry in it if entry.name.endswith(".jpg"))
+    except FileNotFoundError:
+        return []
+
+
 def _parse_name(filename: str) -> tuple[str, str]:
     stem = Path(filename).stem
-    if "__" in stem:
-        src, lut = stem.split("__", 1)
-    else:
-        src, lut = stem, "default"
+    src, lut = split_output_stem(stem) or (stem, "default")
+    # A source is graded with many LUTs and a LUT applies to many sources,
+    # so share one string object per distinct value.
     lut = lut.replace("_", " ").title()
-    return src, lut
+    return sys.intern(src), sys.intern(lut)
 
 
 __all__ = ["GalleryEntry", "build_manifest", "write_manifest"]
@@ -1,14 +1,37 @@
 from __future__ import annotations
 
-import re
+import contextlib
 import subprocess
 import time
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional
+from typing import ContextManager, Dict, List, Optional, Tuple
 
 from .config import ProjectPaths
+from . import placeholder as lqip
 from .models import LutProfile, PhotoAsset
+from .naming import output_stem
+from .placeholder import Placeholder
+from .history import GradeHistory, record_for
+from .trace import FFMPEG_TRACE_ARGS, Tracer, parse_ffmpeg_stats
+
+# Peak RSS per source pixel of the full-size pass, from ffmpeg 7 -benchmark
+# maxrss on 12 MP and 48 MP JPEGs (~8.9-9.4; the gallery pass needs ~5-6.3
+# and transpose adds ~0.4).
+_PROCESS_BYTES = 14 * 1024 * 1024
+_PROCESSED_BYTES_PER_PIXEL = 9.5
+_TRANSFORM_BYTES_PER_PIXEL = 0.5
+
+# EXIF orientation -> ffmpeg transforms that bring the stored pixels upright.
+_ORIENTATION_FILTERS = {
+    2: "hflip",
+    3: "hflip,vflip",
+    4: "vflip",
+    5: "transpose=cclock_flip",
+    6: "transpose=clock",
+    7: "transpose=clock_flip",
+    8: "transpose=cclock",
+}
 
 
 @dataclass(frozen=True)
@@ -17,6 +40,8 @@ class GradeResult:
     gallery_path: Path
     processed_seconds: float
     gallery_seconds: float
+    backend: str = "ffmpeg"
+    placeholder: Optional[Placeholder] = None
 
     @property
     def total_seconds(self) -> float:
@@ -32,26 +57,67 @@ class Grader:
         ffmpeg_bin: str | None = None,
         gallery_landscape_width: int = 2560,
         gallery_vertical_height: int = 2560,
+        tracer: Tracer | None = None,
+        history: GradeHistory | None = None,
+        gallery_aspect: Tuple[int, int] | None = None,
     ) -> None:
         self._paths = paths
         self._ffmpeg = ffmpeg_bin or "ffmpeg"
         self._gallery_landscape_width = gallery_landscape_width
         self._gallery_vertical_height = gallery_vertical_height
+        self._tracer = tracer
+        self._history = history
+        # Landscape aspect (e.g. 16:9); verticals are cropped to its inverse.
+        self._gallery_aspect = gallery_aspect
+
+    def estimate_peak_bytes(self, asset: PhotoAsset) -> int:
+        """Rough peak memory of grading ``asset``, for scheduling.
+
+        The processed and gallery passes run one after the other, so the
+        larger (full-size) pass sets the peak.
+        """
+
+        size = asset.frame_size()
+        if size is None:
+            return 0
+        per_pixel = _PROCESSED_BYTES_PER_PIXEL
+        if asset.orientation() != 1:
+            per_pixel += _TRANSFORM_BYTES_PER_PIXEL
+        return int(size[0] * size[1] * per_pixel + _PROCESS_BYTES)
 
     def apply(self, asset: PhotoAsset, lut: LutProfile, overwrite: bool = True) -> GradeResult:
         """Apply LUT to photo and write processed + gallery variants."""
 
+        started = time.time()
+        try:
+            with self._span("grade", photo=asset.path.name, lut=lut.name) as info:
+                result = self._apply(asset, lut, overwrite)
+                info["backend"] = result.backend
+        except FileExistsError:
+            raise
+        except Exception as err:
+            self._record(asset, lut, started, error=err)
+            raise
+        self._record(asset, lut, started, result=result)
+        return result
+
+    def _apply(self, asset: PhotoAsset, lut: LutProfile, overwrite: bool) -> GradeResult:
+        with self._span("probe", category="exif", photo=asset.path.name) as info:
+            size = asset.frame_size()
+            info["vertical"] = asset.is_vertical()
+            info["orientation"] = asset.orientation()
+
         processed_dir = self._paths.processed / asset.path.stem
         processed_dir.mkdir(parents=True, exist_ok=True)
 
-        lut_slug = _slugify(lut.name)
+        stem = output_stem(asset.path.stem, lut.name)
         src_suffix = asset.path.suffix.lower() or ".jpg"
-        processed_name = f"{asset.path.stem}__{lut_slug}{src_suffix}"
+        processed_name = f"{stem}{src_suffix}"
         processed_path = processed_dir / processed_name
 
         gallery_dir = self._gallery_dir_for(asset)
         gallery_dir.mkdir(parents=True, exist_ok=True)
-        gallery_name = f"{asset.path.stem}__{lut_slug}.jpg"
+        gallery_name = f"{stem}.jpg"
         gallery_path = gallery_dir / gallery_name
 
         if not overwrite and processed_path.exists():
@@ -59,30 +125,44 @@ class Grader:
         if not overwrite and gallery_path.exists():
             raise FileExistsError(gallery_path)
 
-        processed_seconds = self._run_ffmpeg(
+        # Orientation (and the slideshow crop) run inside the same filter
+        # graph as the LUT, so ffmpeg's own autorotate is disabled.
+        processed_source, _ = self._source_filters(asset, size, crop=False)
+        gallery_source, _ = self._source_filters(asset, size, crop=True)
+
+        processed_seconds, _ = self._run_ffmpeg(
             [
                 "-y" if overwrite else "-n",
+                "-noautorotate",
                 "-i",
                 str(asset.path),
                 "-vf",
-                self._build_processed_filter(lut.path),
+                ",".join(processed_source + [self._build_processed_filter(lut.path)]),
                 "-frames:v",
                 "1",
                 str(processed_path),
-            ]
+            ],
+            "processed",
         )
 
-        gallery_seconds = self._run_ffmpeg(
+        # The placeholder is teed off the already-scaled gallery frame.
+        gallery_filter = ",".join(gallery_source + [self._build_gallery_filter(asset, lut.path)])
+        gallery_seconds, thumb = self._run_ffmpeg(
             [
                 "-y" if overwrite else "-n",
+                "-noautorotate",
                 "-i",
                 str(asset.path),
-                "-vf",
-                self._build_gallery_filter(asset, lut.path),
+                "-filter_complex",
+                f"[0:v]{gallery_filter},{lqip.FILTER_TAIL}",
+                "-map",
+                "[gallery]",
                 "-frames:v",
                 "1",
                 str(gallery_path),
-            ]
+                *lqip.OUTPUT_ARGS,
+            ],
+            "gallery",
         )
 
         return GradeResult(
@@ -90,18 +170,93 @@ class Grader:
             gallery_path=gallery_path,
             processed_seconds=processed_seconds,
             gallery_seconds=gallery_seconds,
+            placeholder=self._store_placeholder(gallery_path, thumb),
+        )
+
+    def _record(
+        self,
+        asset: PhotoAsset,
+        lut: LutProfile,
+        started: float,
+        result: GradeResult | None = None,
+        error: Exception | None = None,
+    ) -> None:
+        if self._history is None:
+            return
+        backend = result.backend if result is not None else "ffmpeg"
+        self._history.append(
+            record_for(
+                asset.path,
+                asset.megapixels(),
+                lut.name,
+                backend,
+                started,
+                processed_seconds=result.processed_seconds if result else None,
+                gallery_seconds=result.gallery_seconds if result else None,
+                outputs=(result.processed_path, result.gallery_path) if result else (),
+                error=error,
+            )
         )
 
-    def _run_ffmpeg(self, args: list[str]) -> float:
-        cmd = [self._ffmpeg] + args
+    def _store_placeholder(self, gallery_path: Path, thumb: bytes) -> Optional[Placeholder]:
+        placeholder = lqip.from_ppm(thumb)
+        if placeholder is not None:
+            lqip.write_sidecar(gallery_path, placeholder)
+        else:
+            # Don't let a previous grade's placeholder describe this rendition.
+            lqip.sidecar_path(gallery_path).unlink(missing_ok=True)
+        return placeholder
+
+    def _source_filters(
+        self, asset: PhotoAsset, size: Optional[Tuple[int, int]], crop: bool
+    ) -> Tuple[List[str], Optional[Tuple[int, int]]]:
+        """Filters that orient (and optionally crop) the source, plus the size they yield."""
+
+        filters: List[str] = []
+        orientation = asset.orientation()
+        if orientation in _ORIENTATION_FILTERS:
+            filters.append(_ORIENTATION_FILTERS[orientation])
+        if size is not None and orientation >= 5:
+            size = (size[1], size[0])
+        aspect = self._gallery_aspect if crop else None
+        if aspect is None:
+            return filters, size
+        if asset.is_vertical():
+            aspect = (min(aspect), max(aspect))
+        else:
+            aspect = (max(aspect), min(aspect))
+        if size is None:
+            num, den = aspect
+            filters.append(
+                f"crop='trunc(min(iw,ih*{num}/{den})/2)*2':'trunc(min(ih,iw*{den}/{num})/2)*2'"
+            )
+            return filters, None
+        cropped = _crop_size(size, aspect)
+        if cropped != size:
+            filters.append(f"crop={cropped[0]}:{cropped[1]}")
+        return filters, cropped
+
+    def _span(self, name: str, category: str = "pipeline", **args) -> ContextManager[Dict[str, object]]:
+        if self._tracer is None:
+            return contextlib.nullcontext(args)
+        return self._tracer.span(name, category, **args)
+
+    def _run_ffmpeg(self, args: list[str], label: str = "ffmpeg") -> Tuple[float, bytes]:
+        tracing = self._tracer is not None
+        cmd = [self._ffmpeg] + (FFMPEG_TRACE_ARGS if tracing else []) + args
+        trace_start = self._tracer.now() if tracing else 0.0
         start = time.perf_counter()
-        proc = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+        proc = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
         duration = time.perf_counter() - start
+        stderr = proc.stderr.decode("utf-8", errors="replace")
+        if tracing:
+            stats = parse_ffmpeg_stats(stderr)
+            self._tracer.add_ffmpeg(label, trace_start, duration, stats, exit_code=proc.returncode)
         if proc.returncode != 0:
             raise RuntimeError(
-                f"ffmpeg failed (code {proc.returncode})\ncmd: {' '.join(cmd)}\nstdout: {proc.stdout}\nstderr: {proc.stderr}"
+                f"ffmpeg failed (code {proc.returncode})\ncmd: {' '.join(cmd)}\nstderr: {stderr}"
             )
-        return duration
+        return duration, proc.stdout
 
     def _build_processed_filter(self, lut_path: Path) -> str:
         return f"lut3d=file='{_escape_filter_path(lut_path)}'"
@@ -127,9 +282,15 @@ class Grader:
         return self._paths.gallery / sub
 
 
-def _slugify(name: str) -> str:
-    slug = re.sub(r"[^a-z0-9]+", "_", name.lower()).strip("_")
-    return slug or "lut"
+def _crop_size(size: Tuple[int, int], aspect: Tuple[int, int]) -> Tuple[int, int]:
+    # Largest centred window of ``aspect`` with even sides (for yuv420 output).
+    width, height = size
+    num, den = aspect
+    if width * den > height * num:
+        width = height * num // den
+    else:
+        height = width * den // num
+    return max(2, width - width % 2), max(2, height - height % 2)
 
 
 def _escape_filter_path(path: Path) -> str:
@@ -0,0 +1,158 @@
+"""Append-only grading history and latency/throughput summaries."""
+
+from __future__ import annotations
+
+import json
+import math
+import threading
+import time
+from collections import defaultdict
+from dataclasses import asdict, dataclass, fields
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional
+
+
+@dataclass(frozen=True)
+class GradeRecord:
+    """One grade attempt as stored in the history file."""
+
+    timestamp: float
+    source: str
+    source_bytes: int
+    megapixels: Optional[float]
+    lut: str
+    backend: str
+    total_seconds: float
+    processed_seconds: Optional[float] = None
+    gallery_seconds: Optional[float] = None
+    output_bytes: int = 0
+    status: str = "ok"
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.status == "ok"
+
+
+_FIELDS = {f.name for f in fields(GradeRecord)}
+
+
+class GradeHistory:
+    """JSON-lines history store; one compact line per grade."""
+
+    def __init__(self, path: Path) -> None:
+        self._path = path
+        self._lock = threading.Lock()
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    def append(self, record: GradeRecord) -> None:
+        data = {k: v for k, v in asdict(record).items() if v is not None}
+        line = json.dumps(data, separators=(",", ":")) + "\n"
+        with self._lock:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            with self._path.open("a", encoding="utf-8") as fh:
+                fh.write(line)
+
+    def records(self, since: float | None = None) -> Iterator[GradeRecord]:
+        if not self._path.exists():
+            return
+        with self._path.open("r", encoding="utf-8") as fh:
+            for line in fh:
+                try:
+                    data = json.loads(line)
+                    if not isinstance(data, dict):
+                        continue
+                    record = GradeRecord(**{k: v for k, v in data.items() if k in _FIELDS})
+                except (ValueError, TypeError):
+                    continue
+                if since is None or record.timestamp >= since:
+                    yield record
+
+
+def summarize(records: Iterable[GradeRecord], trend_days: int = 14) -> dict:
+    """Latency percentiles and MP/s grouped by backend, LUT and day."""
+
+    by_backend: Dict[str, List[GradeRecord]] = defaultdict(list)
+    by_lut: Dict[str, List[GradeRecord]] = defaultdict(list)
+    by_day: Dict[str, List[GradeRecord]] = defaultdict(list)
+    total = failed = 0
+    for record in records:
+        total += 1
+        if not record.ok:
+            failed += 1
+            continue
+        by_backend[record.backend].append(record)
+        by_lut[record.lut].append(record)
+        day = datetime.fromtimestamp(record.timestamp, tz=timezone.utc).strftime("%Y-%m-%d")
+        by_day[day].append(record)
+
+    days = sorted(by_day)[-trend_days:]
+    return {
+        "total": total,
+        "failed": failed,
+        "backends": {name: _group_stats(group) for name, group in sorted(by_backend.items())},
+        "luts": {name: _group_stats(group) for name, group in sorted(by_lut.items())},
+        "trend": {day: _group_stats(by_day[day]) for day in days},
+    }
+
+
+def record_for(
+    source: Path,
+    megapixels: Optional[float],
+    lut: str,
+    backend: str,
+    started: float,
+    processed_seconds: Optional[float] = None,
+    gallery_seconds: Optional[float] = None,
+    outputs: Iterable[Path] = (),
+    error: Optional[BaseException] = None,
+) -> GradeRecord:
+    """Build a record for a grade that began at ``started`` (``time.time()``)."""
+
+    return GradeRecord(
+        timestamp=started,
+        source=source.name,
+        source_bytes=_size(source),
+        megapixels=round(megapixels, 3) if megapixels is not None else None,
+        lut=lut,
+        backend=backend,
+        total_seconds=round(time.time() - started, 4),
+        processed_seconds=round(processed_seconds, 4) if processed_seconds is not None else None,
+        gallery_seconds=round(gallery_seconds, 4) if gallery_seconds is not None else None,
+        output_bytes=sum(_size(path) for path in outputs),
+        status="ok" if error is None else "error",
+        error=None if error is None else (str(error).splitlines() or [type(error).__name__])[0][:200],
+    )
+
+
+def _group_stats(records: List[GradeRecord]) -> dict:
+    latencies = sorted(r.total_seconds for r in records)
+    sized = [r for r in records if r.megapixels]
+    seconds = sum(r.total_seconds for r in sized)
+    return {
+        "count": len(records),
+        "p50_seconds": _percentile(latencies, 50),
+        "p95_seconds": _percentile(latencies, 95),
+        "mp_per_second": sum(r.megapixels for r in sized) / seconds if seconds else None,
+    }
+
+
+def _percentile(ordered: List[float], pct: float) -> Optional[float]:
+    if not ordered:
+        return None
+    rank = max(math.ceil(pct / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+def _size(path: Path) -> int:
+    try:
+        return path.stat().st_size
+    except OSError:
+        return 0
+
+
+__all__ = ["GradeHistory", "GradeRecord", "record_for", "summarize"]
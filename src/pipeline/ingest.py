@@ -1,22 +1,60 @@
 from __future__ import annotations
 
+import os
 from pathlib import Path
-from typing import Iterable
+from typing import Iterable, Iterator, Sequence, Set, overload
 
 from .models import PhotoAsset
 
 _SUPPORTED_EXT = {".jpg", ".jpeg", ".png"}
 
 
-def find_new_photos(folder: Path) -> Iterable[PhotoAsset]:
-    """Return photos found in the inbox directory."""
+class AssetTable(Sequence[PhotoAsset]):
+    """Inbox listing stored as one folder plus a tuple of file names.
 
-    if not folder.exists():
-        return []
+    ``PhotoAsset`` objects are built on access, so a very large inbox costs
+    one string per photo instead of a ``Path`` and a dataclass each.
+    """
+
+    __slots__ = ("folder", "names")
+
+    def __init__(self, folder: Path, names: Iterable[str] = ()) -> None:
+        self.folder = folder
+        self.names = tuple(names)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    @overload
+    def __getitem__(self, index: int) -> PhotoAsset: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> "AssetTable": ...
 
-    photos = []
-    for p in sorted(folder.iterdir()):
-        if p.suffix.lower() in _SUPPORTED_EXT:
-            photos.append(PhotoAsset(path=p))
-    return photos
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return AssetTable(self.folder, self.names[index])
+        return PhotoAsset(path=self.folder / self.names[index])
 
+    def __iter__(self) -> Iterator[PhotoAsset]:
+        folder = self.folder
+        for name in self.names:
+            yield PhotoAsset(path=folder / name)
+
+    def stems(self) -> Set[str]:
+        return {os.path.splitext(name)[0] for name in self.names}
+
+
+def find_new_photos(folder: Path) -> AssetTable:
+    """Return photos found in the inbox directory."""
+
+    if not folder.exists():
+        return AssetTable(folder)
+
+    with os.scandir(folder) as it:
+        names = sorted(
+            entry.name
+            for entry in it
+            if os.path.splitext(entry.name)[1].lower() in _SUPPORTED_EXT
+        )
+    return AssetTable(folder, names)
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import functools
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Optional, Tuple
@@ -11,7 +12,7 @@ _MODEL_MAP = {
 }
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class LutProfile:
     """Metadata for a LUT file."""
 
@@ -19,7 +20,7 @@ class LutProfile:
     path: Path
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class PhotoAsset:
     """Represents a source photo staged for grading."""
 
@@ -27,19 +28,42 @@ class PhotoAsset:
 
     def dimensions(self) -> Optional[Tuple[int, int]]:
         try:
-            dims = _read_dimensions(self.path)
-        except Exception:
+            stat = self.path.stat()
+        except OSError:
+            return None
+        dims, orientation = _probe(self.path, stat.st_mtime_ns, stat.st_size)
+        if dims is None:
             return None
-        orientation = None
-        try:
-            orientation = extract_orientation(self.path)
-        except Exception:
-            orientation = None
         if orientation in {5, 6, 7, 8}:
             width, height = dims
             return height, width
         return dims
 
+    def frame_size(self) -> Optional[Tuple[int, int]]:
+        """Stored pixel size, before any EXIF orientation is applied."""
+
+        try:
+            stat = self.path.stat()
+        except OSError:
+            return None
+        return _probe(self.path, stat.st_mtime_ns, stat.st_size)[0]
+
+    def orientation(self) -> int:
+        """EXIF orientation tag (1-8); 1 when absent or unreadable."""
+
+        try:
+            stat = self.path.stat()
+        except OSError:
+            return 1
+        orientation = _probe(self.path, stat.st_mtime_ns, stat.st_size)[1]
+        return orientation if orientation in range(1, 9) else 1
+
+    def megapixels(self) -> Optional[float]:
+        dims = self.frame_size()
+        if not dims:
+            return None
+        return dims[0] * dims[1] / 1_000_000
+
     def is_vertical(self) -> bool:
         dims = self.dimensions()
         if not dims:
@@ -66,6 +90,23 @@ class PhotoAsset:
         return friendly, raw
 
 
+@functools.lru_cache(maxsize=4096)
+def _probe(
+    path: Path, mtime_ns: int, size: int
+) -> Tuple[Optional[Tuple[int, int]], Optional[int]]:
+    # Keyed on mtime/size so long-running callers reuse header reads until
+    # the file changes on disk.
+    try:
+        dims = _read_dimensions(path)
+    except Exception:
+        return None, None
+    try:
+        orientation = extract_orientation(path)
+    except Exception:
+        orientation = None
+    return dims, orientation
+
+
 def _read_dimensions(path: Path) -> Tuple[int, int]:
     suffix = path.suffix.lower()
     if suffix in {".jpg", ".jpeg"}:
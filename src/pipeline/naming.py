@@ -0,0 +1,34 @@
+"""Output naming shared by the grader, gallery manifest and prune."""
+
+from __future__ import annotations
+
+import re
+from typing import Optional, Tuple
+
+ORIENTATIONS = ("landscape", "vertical")
+
+
+def slugify(name: str) -> str:
+    slug = re.sub(r"[^a-z0-9]+", "_", name.lower()).strip("_")
+    return slug or "lut"
+
+
+def output_stem(source_stem: str, lut_name: str) -> str:
+    """Stem of the files written for ``source_stem`` graded with ``lut_name``."""
+
+    return f"{source_stem}__{slugify(lut_name)}"
+
+
+def split_output_stem(stem: str) -> Optional[Tuple[str, str]]:
+    """Split ``<source>__<lut_slug>`` back apart, or None if it isn't one.
+
+    Sources may contain "__" but slugs never do, so split at the last one.
+    """
+
+    if "__" not in stem:
+        return None
+    source, slug = stem.rsplit("__", 1)
+    return source, slug
+
+
+__all__ = ["ORIENTATIONS", "output_stem", "slugify", "split_output_stem"]
@@ -0,0 +1,128 @@
+"""Tiny image placeholders produced alongside gallery renditions."""
+
+from __future__ import annotations
+
+import base64
+import json
+import struct
+import zlib
+from collections import Counter
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Optional, Tuple
+
+PLACEHOLDER_SIZE = 32
+
+# Appended to a gallery filter graph: tee the graded frame into a
+# PLACEHOLDER_SIZE thumbnail that ffmpeg writes to stdout as PPM.
+FILTER_TAIL = (
+    "split=2[gallery][thumb];"
+    "[thumb]scale='if(gt(iw,ih),{size},-1)':'if(gt(iw,ih),-1,{size})':flags=area,"
+    "format=rgb24[placeholder]"
+).format(size=PLACEHOLDER_SIZE)
+OUTPUT_ARGS = ["-map", "[placeholder]", "-frames:v", "1", "-c:v", "ppm", "-f", "image2pipe", "pipe:1"]
+
+
+@dataclass(frozen=True)
+class Placeholder:
+    width: int
+    height: int
+    data_uri: str
+    color: str
+
+
+def from_ppm(blob: bytes) -> Optional[Placeholder]:
+    """Build a placeholder from the binary PPM ffmpeg wrote to stdout."""
+
+    try:
+        width, height, pixels = _parse_ppm(blob)
+    except ValueError:
+        return None
+    return Placeholder(
+        width=width,
+        height=height,
+        data_uri="data:image/png;base64," + base64.b64encode(_encode_png(width, height, pixels)).decode("ascii"),
+        color=_dominant_color(pixels),
+    )
+
+
+def sidecar_path(image_path: Path) -> Path:
+    return image_path.with_suffix(".json")
+
+
+def write_sidecar(image_path: Path, placeholder: Placeholder) -> Path:
+    path = sidecar_path(image_path)
+    path.write_text(json.dumps(asdict(placeholder), separators=(",", ":")))
+    return path
+
+
+def read_sidecar(image_path: Path) -> Optional[Placeholder]:
+    path = sidecar_path(image_path)
+    if not path.exists():
+        return None
+    try:
+        return Placeholder(**json.loads(path.read_text()))
+    except (ValueError, TypeError):
+        return None
+
+
+def _parse_ppm(blob: bytes) -> Tuple[int, int, bytes]:
+    tokens = []
+    pos = 0
+    while len(tokens) < 4:
+        while pos < len(blob) and blob[pos : pos + 1].isspace():
+            pos += 1
+        if blob[pos : pos + 1] == b"#":
+            pos = blob.index(b"\n", pos)
+            continue
+        end = pos
+        while end < len(blob) and not blob[end : end + 1].isspace():
+            end += 1
+        if end == pos:
+            raise ValueError("truncated PPM header")
+        tokens.append(blob[pos:end])
+        pos = end
+    if tokens[0] != b"P6" or tokens[3] != b"255":
+        raise ValueError("expected 8-bit binary PPM")
+    width, height = int(tokens[1]), int(tokens[2])
+    pixels = blob[pos + 1 : pos + 1 + width * height * 3]
+    if len(pixels) != width * height * 3:
+        raise ValueError("truncated PPM data")
+    return width, height, pixels
+
+
+def _encode_png(width: int, height: int, pixels: bytes) -> bytes:
+    stride = width * 3
+    raw = b"".join(b"\x00" + pixels[y * stride : (y + 1) * stride] for y in range(height))
+
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data) & 0xFFFFFFFF)
+
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+        + chunk(b"IDAT", zlib.compress(raw, 9))
+        + chunk(b"IEND", b"")
+    )
+
+
+def _dominant_color(pixels: bytes) -> str:
+    # Most populated 4-bit-per-channel bucket, averaged back to full precision.
+    buckets: Counter = Counter()
+    sums: dict = {}
+    for idx in range(0, len(pixels), 3):
+        r, g, b = pixels[idx], pixels[idx + 1], pixels[idx + 2]
+        key = (r >> 4, g >> 4, b >> 4)
+        buckets[key] += 1
+        total = sums.setdefault(key, [0, 0, 0])
+        total[0] += r
+        total[1] += g
+        total[2] += b
+    if not buckets:
+        return "#000000"
+    key, count = buckets.most_common(1)[0]
+    r, g, b = (value // count for value in sums[key])
+    return f"#{r:02x}{g:02x}{b:02x}"
+
+
+__all__ = ["Placeholder", "from_ppm", "read_sidecar", "sidecar_path", "write_sidecar"]
@@ -0,0 +1,91 @@
+"""Reconcile processed and gallery outputs against the inbox and LUTs."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, List, Set, Tuple
+
+from .config import ProjectPaths
+from .ingest import find_new_photos
+from .lut import LutLibrary
+from .naming import ORIENTATIONS, slugify, split_output_stem
+
+
+@dataclass(frozen=True)
+class StaleOutput:
+    path: Path
+    size: int
+    reason: str
+
+
+@dataclass(frozen=True)
+class PruneReport:
+    stale: Tuple[StaleOutput, ...]
+    dry_run: bool
+
+    @property
+    def total_bytes(self) -> int:
+        return sum(item.size for item in self.stale)
+
+    def touches_gallery(self, paths: ProjectPaths) -> bool:
+        return any(paths.gallery in item.path.parents for item in self.stale)
+
+
+def find_stale_outputs(paths: ProjectPaths, library: LutLibrary) -> List[StaleOutput]:
+    """List outputs whose source photo or LUT no longer exists.
+
+    Outputs are matched by the ``<stem>__<lut_slug>`` names Grader writes;
+    files that don't follow that pattern are left alone.
+    """
+
+    stems = find_new_photos(paths.inbox).stems()
+    slugs = {slugify(profile.name) for profile in library.profiles()}
+    if not stems:
+        raise RuntimeError(f"refusing to prune: no photos found in {paths.inbox}")
+    if not slugs:
+        raise RuntimeError(f"refusing to prune: no LUTs found in {paths.luts}")
+
+    stale: List[StaleOutput] = []
+    if paths.processed.exists():
+        for folder in sorted(p for p in paths.processed.iterdir() if p.is_dir()):
+            stale.extend(_check_files(folder.iterdir(), stems, slugs))
+    for orientation in ORIENTATIONS:
+        folder = paths.gallery / orientation
+        if folder.exists():
+            stale.extend(_check_files(folder.iterdir(), stems, slugs))
+    return stale
+
+
+def prune_outputs(paths: ProjectPaths, library: LutLibrary, dry_run: bool = False) -> PruneReport:
+    """Delete stale outputs (or only report them with ``dry_run``)."""
+
+    stale = find_stale_outputs(paths, library)
+    if not dry_run:
+        for item in stale:
+            item.path.unlink(missing_ok=True)
+        if paths.processed.exists():
+            for folder in paths.processed.iterdir():
+                if folder.is_dir() and not any(folder.iterdir()):
+                    folder.rmdir()
+    return PruneReport(stale=tuple(stale), dry_run=dry_run)
+
+
+def _check_files(files: Iterable[Path], stems: Set[str], slugs: Set[str]) -> List[StaleOutput]:
+    stale = []
+    for file in sorted(files):
+        parts = split_output_stem(file.stem)
+        if parts is None or not file.is_file():
+            continue
+        source, slug = parts
+        if source not in stems:
+            reason = "source removed"
+        elif slug not in slugs:
+            reason = "LUT removed"
+        else:
+            continue
+        stale.append(StaleOutput(path=file, size=file.stat().st_size, reason=reason))
+    return stale
+
+
+__all__ = ["PruneReport", "StaleOutput", "find_stale_outputs", "prune_outputs"]
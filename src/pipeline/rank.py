@@ -0,0 +1,235 @@
+"""Shortlist LUTs by grading a tiny proxy with every look at once."""
+
+from __future__ import annotations
+
+import subprocess
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, List, Sequence, Tuple
+
+try:  # NumPy is only needed for ranking.
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised without numpy installed
+    np = None
+
+from .exif import extract_thumbnail
+from .models import LutProfile, PhotoAsset
+
+PROXY_SIZE = 96
+
+# Score = contrast and saturation rewarded, clipped pixels penalised.
+_CONTRAST_WEIGHT = 2.0
+_SATURATION_WEIGHT = 1.0
+_CLIPPING_WEIGHT = 4.0
+_CLIP_LOW = 1.0 / 255.0
+_CLIP_HIGH = 254.0 / 255.0
+_LUMA = (0.2126, 0.7152, 0.0722)
+
+
+@dataclass(frozen=True)
+class LutScore:
+    name: str
+    score: float
+    clipping: float
+    saturation: float
+    contrast: float
+
+
+@dataclass(frozen=True)
+class RankResult:
+    scores: Tuple[LutScore, ...]
+    proxy_source: str
+    proxy_pixels: int
+    decode_seconds: float
+    rank_seconds: float
+
+    def top(self, count: int) -> Tuple[LutScore, ...]:
+        return self.scores[:count]
+
+
+class LutStack:
+    """All LUT tables stacked into one tensor for batched lookups.
+
+    LUTs are grouped by cube size; every look in the repo is 16³, so in
+    practice this is a single ``(L, N, N, N, 3)`` array.
+    """
+
+    def __init__(self, profiles: Iterable[LutProfile]) -> None:
+        _require_numpy()
+        groups: dict[int, list] = {}
+        for profile in profiles:
+            table, domain_min, domain_max = load_cube(profile.path)
+            groups.setdefault(table.shape[0], []).append((profile.name, table, domain_min, domain_max))
+        self._groups = []
+        for entries in groups.values():
+            names = [entry[0] for entry in entries]
+            tables = np.stack([entry[1] for entry in entries])
+            mins = np.stack([entry[2] for entry in entries])
+            spans = np.stack([entry[3] - entry[2] for entry in entries])
+            spans[spans == 0] = 1.0
+            self._groups.append((names, tables, mins, spans))
+
+    @property
+    def names(self) -> List[str]:
+        return [name for names, *_ in self._groups for name in names]
+
+    def apply(self, pixels: "np.ndarray") -> Tuple[List[str], "np.ndarray"]:
+        """Grade ``(M, 3)`` pixels in [0, 1] with every LUT -> ``(L, M, 3)``."""
+
+        names: List[str] = []
+        outputs = []
+        for group_names, tables, mins, spans in self._groups:
+            names.extend(group_names)
+            outputs.append(_trilinear(tables, (pixels[None] - mins[:, None]) / spans[:, None]))
+        return names, np.concatenate(outputs) if outputs else np.empty((0,) + pixels.shape)
+
+
+def load_cube(path: Path) -> Tuple["np.ndarray", "np.ndarray", "np.ndarray"]:
+    """Parse a .cube file into a ``[b, g, r]``-indexed ``(N, N, N, 3)`` table."""
+
+    _require_numpy()
+    size = None
+    domain_min = np.zeros(3)
+    domain_max = np.ones(3)
+    values: List[List[float]] = []
+    for line in path.read_text().splitlines():
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        head = line.split(None, 1)[0]
+        if head == "LUT_3D_SIZE":
+            size = int(line.split()[1])
+        elif head == "DOMAIN_MIN":
+            domain_min = np.array([float(v) for v in line.split()[1:4]])
+        elif head == "DOMAIN_MAX":
+            domain_max = np.array([float(v) for v in line.split()[1:4]])
+        elif head[0].isdigit() or head[0] in "-.":
+            values.append([float(v) for v in line.split()[:3]])
+        # TITLE, LUT_1D_SIZE and other keywords are ignored.
+    if size is None or len(values) != size**3:
+        raise ValueError(f"{path.name}: expected a 3D LUT with {size or '?'}³ entries")
+    # .cube lists red fastest, so the flat table reshapes to [b][g][r].
+    table = np.asarray(values, dtype=np.float32).reshape(size, size, size, 3)
+    return table, domain_min.astype(np.float32), domain_max.astype(np.float32)
+
+
+def decode_proxy(asset: PhotoAsset, ffmpeg: str = "ffmpeg") -> Tuple["np.ndarray", str]:
+    """Decode a tiny RGB proxy, preferring the embedded EXIF thumbnail."""
+
+    _require_numpy()
+    thumbnail = None
+    try:
+        thumbnail = extract_thumbnail(asset.path)
+    except Exception:
+        thumbnail = None
+    source = "exif-thumbnail" if thumbnail else "decoded"
+    cmd = [ffmpeg, "-v", "error"]
+    if thumbnail:
+        cmd += ["-f", "jpeg_pipe", "-i", "pipe:0"]
+    else:
+        cmd += ["-i", str(asset.path)]
+    cmd += [
+        "-frames:v", "1",
+        "-vf", f"scale={PROXY_SIZE}:{PROXY_SIZE}:force_original_aspect_ratio=decrease:flags=area",
+        "-f", "rawvideo", "-pix_fmt", "rgb24", "pipe:1",
+    ]
+    proc = subprocess.run(cmd, input=thumbnail, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    if proc.returncode != 0 or not proc.stdout:
+        raise RuntimeError(
+            f"ffmpeg failed (code {proc.returncode})\ncmd: {' '.join(cmd)}\n"
+            f"stderr: {proc.stderr.decode('utf-8', errors='replace')}"
+        )
+    pixels = np.frombuffer(proc.stdout, dtype=np.uint8).reshape(-1, 3)
+    return pixels.astype(np.float32) / 255.0, source
+
+
+def rank_luts(
+    asset: PhotoAsset,
+    profiles: Sequence[LutProfile] | LutStack,
+    ffmpeg: str = "ffmpeg",
+) -> RankResult:
+    """Score every LUT on a proxy of ``asset``, best first."""
+
+    stack = profiles if isinstance(profiles, LutStack) else LutStack(profiles)
+    start = time.perf_counter()
+    pixels, source = decode_proxy(asset, ffmpeg=ffmpeg)
+    decoded = time.perf_counter()
+    names, graded = stack.apply(pixels)
+    scores = score_images(names, graded)
+    return RankResult(
+        scores=tuple(sorted(scores, key=lambda s: s.score, reverse=True)),
+        proxy_source=source,
+        proxy_pixels=len(pixels),
+        decode_seconds=decoded - start,
+        rank_seconds=time.perf_counter() - decoded,
+    )
+
+
+def score_images(names: Sequence[str], graded: "np.ndarray") -> List[LutScore]:
+    """Cheap look statistics over ``(L, M, 3)`` graded pixels."""
+
+    clipped = ((graded <= _CLIP_LOW) | (graded >= _CLIP_HIGH)).any(axis=2).mean(axis=1)
+    high = graded.max(axis=2)
+    low = graded.min(axis=2)
+    saturation = np.where(high > 0, (high - low) / np.maximum(high, 1e-6), 0.0).mean(axis=1)
+    contrast = (graded @ np.asarray(_LUMA, dtype=graded.dtype)).std(axis=1)
+    total = (
+        _CONTRAST_WEIGHT * contrast
+        + _SATURATION_WEIGHT * saturation
+        - _CLIPPING_WEIGHT * clipped
+    )
+    return [
+        LutScore(
+            name=name,
+            score=float(total[idx]),
+            clipping=float(clipped[idx]),
+            saturation=float(saturation[idx]),
+            contrast=float(contrast[idx]),
+        )
+        for idx, name in enumerate(names)
+    ]
+
+
+def _trilinear(tables: "np.ndarray", coords: "np.ndarray") -> "np.ndarray":
+    # tables: (L, N, N, N, 3) indexed [l, b, g, r]; coords: (L, M, 3) rgb in [0, 1].
+    count, size = tables.shape[0], tables.shape[1]
+    scaled = np.clip(coords, 0.0, 1.0) * (size - 1)
+    base = np.minimum(scaled.astype(np.intp), size - 2)
+    frac = (scaled - base).astype(tables.dtype)
+    fr, fg, fb = frac[..., 0:1], frac[..., 1:2], frac[..., 2:3]
+    # Gather from one flat table so each corner is a single np.take.
+    flat = tables.reshape(-1, 3)
+    origin = (
+        np.arange(count, dtype=np.intp)[:, None] * size**3
+        + base[..., 2] * size * size
+        + base[..., 1] * size
+        + base[..., 0]
+    )
+
+    def corner(db: int, dg: int, dr: int) -> "np.ndarray":
+        return np.take(flat, origin + (db * size * size + dg * size + dr), axis=0)
+
+    c00 = corner(0, 0, 0) * (1 - fr) + corner(0, 0, 1) * fr
+    c01 = corner(0, 1, 0) * (1 - fr) + corner(0, 1, 1) * fr
+    c10 = corner(1, 0, 0) * (1 - fr) + corner(1, 0, 1) * fr
+    c11 = corner(1, 1, 0) * (1 - fr) + corner(1, 1, 1) * fr
+    c0 = c00 * (1 - fg) + c01 * fg
+    c1 = c10 * (1 - fg) + c11 * fg
+    return np.clip(c0 * (1 - fb) + c1 * fb, 0.0, 1.0)
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise RuntimeError("LUT ranking requires numpy (pip install numpy)")
+
+
+__all__ = [
+    "LutScore",
+    "LutStack",
+    "RankResult",
+    "decode_proxy",
+    "load_cube",
+    "rank_luts",
+    "score_images",
+]
@@ -0,0 +1,347 @@
+"""Long-running local grading service backed by a warm worker pool."""
+
+from __future__ import annotations
+
+import http.server
+import json
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+
+from .config import ProjectPaths
+from .grade import Grader, GradeResult
+from .ingest import find_new_photos
+from .lut import LutLibrary
+from .models import LutProfile, PhotoAsset
+from .trace import Tracer
+
+_MAX_FINISHED_JOBS = 1000
+
+
+@dataclass
+class GradeJob:
+    """Tracks one submitted grade through the worker pool."""
+
+    id: str
+    asset: PhotoAsset
+    lut: LutProfile
+    overwrite: bool
+    submitted_at: float
+    status: str = "queued"
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    result: Optional[GradeResult] = None
+    error: Optional[str] = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ("done", "failed")
+
+    def to_dict(self) -> dict:
+        data = {
+            "id": self.id,
+            "status": self.status,
+            "photo": self.asset.path.name,
+            "lut": self.lut.name,
+            "submitted_at": self.submitted_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+        if self.error is not None:
+            data["error"] = self.error
+        return data
+
+    def result_dict(self) -> dict:
+        result = self.result
+        if result is None:
+            return {}
+        return {
+            "processed_path": str(result.processed_path),
+            "gallery_path": str(result.gallery_path),
+            "processed_seconds": result.processed_seconds,
+            "gallery_seconds": result.gallery_seconds,
+            "total_seconds": result.total_seconds,
+            "backend": result.backend,
+        }
+
+
+class _MemoryBudget:
+    """Counting semaphore over bytes; an oversized job may run alone."""
+
+    def __init__(self, limit: int) -> None:
+        self._limit = limit
+        self._used = 0
+        self._cond = threading.Condition()
+
+    def acquire(self, amount: int) -> int:
+        amount = min(amount, self._limit)
+        with self._cond:
+            while self._used and self._used + amount > self._limit:
+                self._cond.wait()
+            self._used += amount
+        return amount
+
+    def release(self, amount: int) -> None:
+        with self._cond:
+            self._used -= amount
+            self._cond.notify_all()
+
+
+class GradingService:
+    """Keep LUTs and inbox metadata warm and dispatch grades to a pool.
+
+    Directory listings are only rescanned when the inbox or LUT folder
+    changes on disk, so a submit costs two dict lookups in the common case.
+    Concurrency is bounded by ``workers`` and, when ``memory_budget_mb`` is
+    set, by the grader's peak-memory estimate for each queued job. A submit
+    for a photo/LUT pair that is already queued or running returns that
+    job instead of grading the same outputs twice.
+    """
+
+    def __init__(
+        self,
+        paths: ProjectPaths,
+        workers: int | None = None,
+        grader: Grader | None = None,
+        memory_budget_mb: int | None = None,
+        tracer: Tracer | None = None,
+    ) -> None:
+        self._paths = paths
+        self._tracer = tracer
+        self._grader = grader or Grader(paths, tracer=tracer)
+        self._budget = (
+            _MemoryBudget(memory_budget_mb * 1024 * 1024) if memory_budget_mb else None
+        )
+        self._library = LutLibrary(paths.luts)
+        self._library.ensure()
+        self._pool = ThreadPoolExecutor(
+            max_workers=workers or os.cpu_count() or 1,
+            thread_name_prefix="grade",
+        )
+        self._lock = threading.Lock()
+        self._jobs: Dict[str, GradeJob] = {}
+        self._active: Dict[Tuple[Path, str], GradeJob] = {}
+        self._photos: Dict[str, PhotoAsset] = {}
+        self._photos_stamp: Optional[int] = None
+        self._luts: Dict[str, LutProfile] = {}
+        self._luts_stamp: Optional[int] = None
+        self.warm()
+
+    @property
+    def paths(self) -> ProjectPaths:
+        return self._paths
+
+    @property
+    def tracer(self) -> Optional[Tracer]:
+        return self._tracer
+
+    def warm(self) -> None:
+        """Rescan inbox and LUT folders if they changed since the last scan."""
+
+        with self._lock:
+            added = self._warm_locked()
+        self._prime(added)
+
+    def submit(self, photo_name: str, lut_name: str, overwrite: bool = True) -> GradeJob:
+        with self._lock:
+            added = self._warm_locked()
+            asset = self._photos.get(photo_name.lower())
+            lut = self._luts.get(lut_name.lower())
+            if asset is None or lut is None:
+                # Directory mtimes can be too coarse to notice a file added
+                # in the same tick as the last scan, so rescan once.
+                added += self._warm_locked(force=True)
+                asset = self._photos.get(photo_name.lower())
+                lut = self._luts.get(lut_name.lower())
+            if asset is None or lut is None:
+                self._prime(added)
+                if asset is None:
+                    raise LookupError(f"photo '{photo_name}' not found in inbox")
+                raise LookupError(f"LUT '{lut_name}' not found")
+            key = (asset.path, lut.name)
+            active = self._active.get(key)
+            if active is not None:
+                return active
+            job = GradeJob(
+                id=uuid.uuid4().hex,
+                asset=asset,
+                lut=lut,
+                overwrite=overwrite,
+                submitted_at=time.time(),
+            )
+            self._jobs[job.id] = job
+            self._active[key] = job
+            self._prune_locked()
+        self._prime(added)
+        self._pool.submit(self._run, job)
+        return job
+
+    def get(self, job_id: str) -> Optional[GradeJob]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._pool.shutdown(wait=wait)
+
+    def _run(self, job: GradeJob) -> None:
+        reserved = 0
+        if self._budget is not None:
+            reserved = self._budget.acquire(self._grader.estimate_peak_bytes(job.asset))
+        job.started_at = time.time()
+        job.status = "running"
+        try:
+            job.result = self._grader.apply(job.asset, job.lut, overwrite=job.overwrite)
+        except FileExistsError as err:
+            job.error = f"target exists: {err}"
+            job.status = "failed"
+        except Exception as err:
+            job.error = str(err)
+            job.status = "failed"
+        else:
+            job.status = "done"
+        finally:
+            job.finished_at = time.time()
+            with self._lock:
+                self._active.pop((job.asset.path, job.lut.name), None)
+            if self._budget is not None:
+                self._budget.release(reserved)
+
+    def _warm_locked(self, force: bool = False) -> Tuple[PhotoAsset, ...]:
+        """Rescan changed folders (all with ``force``); return photos not seen before."""
+
+        added: Tuple[PhotoAsset, ...] = ()
+        photos_stamp = _dir_stamp(self._paths.inbox)
+        if force or photos_stamp is None or photos_stamp != self._photos_stamp:
+            previous = self._photos
+            self._photos = {
+                asset.path.name.lower(): asset for asset in find_new_photos(self._paths.inbox)
+            }
+            added = tuple(
+                asset for key, asset in self._photos.items() if previous.get(key) != asset
+            )
+            self._photos_stamp = photos_stamp
+
+        luts_stamp = _dir_stamp(self._paths.luts)
+        if force or luts_stamp is None or luts_stamp != self._luts_stamp:
+            self._library.refresh()
+            self._luts = {profile.name.lower(): profile for profile in self._library.profiles()}
+            self._luts_stamp = luts_stamp
+        return added
+
+    def _prime(self, assets: Iterable[PhotoAsset]) -> None:
+        # Header/EXIF reads touch every new file, so they run off the lock
+        # (and off the request thread) to keep submits and polls responsive.
+        assets = tuple(assets)
+        if assets:
+            threading.Thread(
+                target=_prime_headers, args=(assets,), name="prime", daemon=True
+            ).start()
+
+    def _prune_locked(self) -> None:
+        finished = [job for job in self._jobs.values() if job.finished]
+        excess = len(finished) - _MAX_FINISHED_JOBS
+        if excess <= 0:
+            return
+        finished.sort(key=lambda job: job.finished_at or 0.0)
+        for job in finished[:excess]:
+            del self._jobs[job.id]
+
+
+class _ApiHandler(http.server.BaseHTTPRequestHandler):
+    service: GradingService
+
+    def do_POST(self) -> None:  # noqa: N802 - http.server naming
+        if self.path.rstrip("/") != "/jobs":
+            self._send(404, {"error": "not found"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+            payload = json.loads(self.rfile.read(length) or b"{}")
+            photo = payload["photo"]
+            lut = payload["lut"]
+        except (ValueError, KeyError, TypeError):
+            self._send(400, {"error": "expected JSON body with 'photo' and 'lut'"})
+            return
+        if not isinstance(photo, str) or not isinstance(lut, str):
+            self._send(400, {"error": "'photo' and 'lut' must be strings"})
+            return
+        overwrite = payload.get("overwrite", True)
+        if not isinstance(overwrite, bool):
+            self._send(400, {"error": "'overwrite' must be true or false"})
+            return
+        try:
+            job = self.service.submit(photo, lut, overwrite=overwrite)
+        except LookupError as err:
+            self._send(404, {"error": str(err)})
+            return
+        self._send(202, job.to_dict())
+
+    def do_GET(self) -> None:  # noqa: N802 - http.server naming
+        parts = [part for part in self.path.split("?", 1)[0].split("/") if part]
+        if parts == ["trace"]:
+            tracer = self.service.tracer
+            if tracer is None:
+                self._send(404, {"error": "tracing is not enabled"})
+            else:
+                self._send(200, tracer.to_chrome_trace())
+            return
+        if len(parts) not in (2, 3) or parts[0] != "jobs":
+            self._send(404, {"error": "not found"})
+            return
+        job = self.service.get(parts[1])
+        if job is None:
+            self._send(404, {"error": f"unknown job '{parts[1]}'"})
+            return
+        if len(parts) == 2:
+            self._send(200, job.to_dict())
+        elif parts[2] != "result":
+            self._send(404, {"error": "not found"})
+        elif job.status == "done":
+            self._send(200, {**job.to_dict(), "result": job.result_dict()})
+        elif job.status == "failed":
+            self._send(500, job.to_dict())
+        else:
+            self._send(202, job.to_dict())
+
+    def _send(self, code: int, body: dict) -> None:
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+def make_api_server(
+    service: GradingService, host: str = "127.0.0.1", port: int = 8001
+) -> http.server.ThreadingHTTPServer:
+    """Bind the submit/status/result API for ``service``.
+
+    Endpoints: ``POST /jobs`` with ``{"photo", "lut", "overwrite"}``,
+    ``GET /jobs/<id>``, ``GET /jobs/<id>/result`` and, when the service
+    has a tracer, ``GET /trace`` (Chrome trace-event JSON).
+    """
+
+    handler = type("ApiHandler", (_ApiHandler,), {"service": service})
+    return http.server.ThreadingHTTPServer((host, port), handler)
+
+
+def _prime_headers(assets: Iterable[PhotoAsset]) -> None:
+    for asset in assets:
+        # Fills the header cache so the first grade doesn't pay for it.
+        asset.dimensions()
+
+
+def _dir_stamp(path: Path) -> Optional[int]:
+    try:
+        return path.stat().st_mtime_ns
+    except OSError:
+        return None
+
+
+__all__ = ["GradeJob", "GradingService", "make_api_server"]
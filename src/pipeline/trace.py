@@ -0,0 +1,183 @@
+"""Per-stage timing spans for grades, exportable as Chrome trace JSON."""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Deque, Dict, Iterator, List, Optional
+
+_BENCH_STAGE = re.compile(r"^bench:\s+(\d+) user\s+(\d+) sys\s+(\d+) real (\w+)", re.MULTILINE)
+_BENCH_TOTAL = re.compile(r"^bench: utime=([\d.]+)s stime=([\d.]+)s rtime=([\d.]+)s", re.MULTILINE)
+_BENCH_RSS = re.compile(r"^bench: maxrss=(\d+)\s*k", re.MULTILINE | re.IGNORECASE)
+_PROGRESS = re.compile(r"^(\w+)=(\S+)$", re.MULTILINE)
+
+# Arguments that make ffmpeg report per-stage timings on stderr.
+FFMPEG_TRACE_ARGS = ["-hide_banner", "-nostats", "-benchmark", "-benchmark_all", "-progress", "pipe:2"]
+
+
+@dataclass(frozen=True)
+class Span:
+    name: str
+    category: str
+    start: float
+    duration: float
+    thread_id: int
+    args: Dict[str, object] = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class FfmpegStats:
+    """Timings ffmpeg reports about itself with ``-benchmark_all``."""
+
+    decode_seconds: float = 0.0
+    encode_seconds: float = 0.0
+    user_seconds: Optional[float] = None
+    system_seconds: Optional[float] = None
+    real_seconds: Optional[float] = None
+    max_rss_kb: Optional[int] = None
+    progress: Dict[str, str] = field(default_factory=dict)
+
+
+class Tracer:
+    """Collects spans from any thread; keeps the most recent ``max_spans``."""
+
+    def __init__(self, max_spans: int = 100_000) -> None:
+        self._origin = time.perf_counter()
+        self._spans: Deque[Span] = deque(maxlen=max_spans)
+        self._threads: Dict[int, str] = {}
+        self._lock = threading.Lock()
+
+    def now(self) -> float:
+        return time.perf_counter() - self._origin
+
+    @contextmanager
+    def span(self, name: str, category: str = "pipeline", **args) -> Iterator[Dict[str, object]]:
+        """Time the enclosed block; the yielded dict is stored as span args."""
+
+        start = self.now()
+        try:
+            yield args
+        except BaseException as err:
+            args["error"] = repr(err)
+            raise
+        finally:
+            self.add(name, start, self.now() - start, category, **args)
+
+    def add(self, name: str, start: float, duration: float, category: str = "pipeline", **args) -> None:
+        thread = threading.current_thread()
+        span = Span(name, category, start, max(duration, 0.0), thread.ident or 0, args)
+        with self._lock:
+            self._spans.append(span)
+            self._threads.setdefault(span.thread_id, thread.name)
+
+    def add_ffmpeg(self, label: str, start: float, wall: float, stats: FfmpegStats, **args) -> None:
+        """Record one ffmpeg run and its stages laid out within ``wall``.
+
+        ffmpeg only reports decode and encode directly; spawn is the wall
+        time it didn't account for and filtering is the remainder of its
+        own real time.
+        """
+
+        real = stats.real_seconds if stats.real_seconds is not None else wall
+        spawn = max(wall - real, 0.0)
+        filters = max(real - stats.decode_seconds - stats.encode_seconds, 0.0)
+        self.add(
+            f"ffmpeg:{label}",
+            start,
+            wall,
+            "ffmpeg",
+            user_seconds=stats.user_seconds,
+            system_seconds=stats.system_seconds,
+            max_rss_kb=stats.max_rss_kb,
+            **stats.progress,
+            **args,
+        )
+        offset = start
+        for stage, duration in (
+            ("spawn", spawn),
+            ("decode", stats.decode_seconds),
+            ("filter", filters),
+            ("encode", stats.encode_seconds),
+        ):
+            self.add(f"{label}:{stage}", offset, duration, "ffmpeg")
+            offset += duration
+
+    def spans(self) -> List[Span]:
+        with self._lock:
+            return list(self._spans)
+
+    def to_chrome_trace(self) -> dict:
+        pid = os.getpid()
+        with self._lock:
+            spans = list(self._spans)
+            threads = dict(self._threads)
+        events = [
+            {
+                "name": "thread_name",
+                "ph": "M",
+                "pid": pid,
+                "tid": tid,
+                "args": {"name": name},
+            }
+            for tid, name in threads.items()
+        ]
+        for span in spans:
+            events.append(
+                {
+                    "name": span.name,
+                    "cat": span.category,
+                    "ph": "X",
+                    "ts": round(span.start * 1_000_000, 3),
+                    "dur": round(span.duration * 1_000_000, 3),
+                    "pid": pid,
+                    "tid": span.thread_id,
+                    "args": {k: v for k, v in span.args.items() if v is not None},
+                }
+            )
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write_chrome_trace(self, path: Path) -> Path:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.to_chrome_trace()))
+        return path
+
+
+def parse_ffmpeg_stats(stderr: str) -> FfmpegStats:
+    """Parse ``-benchmark``/``-benchmark_all``/``-progress`` output."""
+
+    decode = encode = 0.0
+    for _user, _sys, real, stage in _BENCH_STAGE.findall(stderr):
+        seconds = int(real) / 1_000_000
+        if stage.startswith("decode"):
+            decode += seconds
+        elif stage.startswith(("encode", "flush")):
+            encode += seconds
+    user = system = real_total = None
+    total = _BENCH_TOTAL.search(stderr)
+    if total:
+        user, system, real_total = (float(v) for v in total.groups())
+    rss = _BENCH_RSS.search(stderr)
+    progress = {
+        key: value
+        for key, value in _PROGRESS.findall(stderr)
+        if key in ("frame", "total_size", "speed")
+    }
+    return FfmpegStats(
+        decode_seconds=decode,
+        encode_seconds=encode,
+        user_seconds=user,
+        system_seconds=system,
+        real_seconds=real_total,
+        max_rss_kb=int(rss.group(1)) if rss else None,
+        progress=progress,
+    )
+
+
+__all__ = ["FFMPEG_TRACE_ARGS", "FfmpegStats", "Span", "Tracer", "parse_ffmpeg_stats"]
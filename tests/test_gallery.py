@@ -0,0 +1,23 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from pipeline.config import ProjectPaths  # noqa: E402
+from pipeline.gallery import build_manifest  # noqa: E402
+
+
+def _touch(path: Path) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"x")
+    return path
+
+
+def test_source_stems_containing_double_underscore_keep_their_lut(tmp_path):
+    paths = ProjectPaths(root=tmp_path)
+    _touch(paths.gallery / "landscape" / "a__b__golden_light.jpg")
+    _touch(paths.gallery / "vertical" / "plain.jpg")
+
+    manifest = build_manifest(paths)
+    assert [(e["source"], e["lut"]) for e in manifest["landscape"]] == [("a__b", "Golden Light")]
+    assert [(e["source"], e["lut"]) for e in manifest["vertical"]] == [("plain", "Default")]
@@ -0,0 +1,46 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from pipeline.config import ProjectPaths  # noqa: E402
+from pipeline.lut import LutLibrary  # noqa: E402
+from pipeline.prune import find_stale_outputs, prune_outputs  # noqa: E402
+
+
+def _touch(path: Path) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"x")
+    return path
+
+
+def _project(tmp_path: Path):
+    paths = ProjectPaths(root=tmp_path)
+    _touch(paths.luts / "Golden Light.cube")
+    library = LutLibrary(paths.luts)
+    library.refresh()
+    return paths, library
+
+
+def test_source_stems_containing_double_underscore_are_kept(tmp_path):
+    paths, library = _project(tmp_path)
+    _touch(paths.inbox / "a__b.jpg")
+    live = [
+        _touch(paths.processed / "a__b" / "a__b__golden_light.jpg"),
+        _touch(paths.gallery / "landscape" / "a__b__golden_light.jpg"),
+    ]
+
+    assert find_stale_outputs(paths, library) == []
+    report = prune_outputs(paths, library)
+    assert report.stale == ()
+    assert all(path.exists() for path in live)
+
+
+def test_outputs_of_removed_sources_and_luts_are_stale(tmp_path):
+    paths, library = _project(tmp_path)
+    _touch(paths.inbox / "a__b.jpg")
+    gone_source = _touch(paths.gallery / "landscape" / "a__c__golden_light.jpg")
+    gone_lut = _touch(paths.gallery / "vertical" / "a__b__ocean_blues.jpg")
+
+    stale = {item.path: item.reason for item in find_stale_outputs(paths, library)}
+    assert stale == {gone_source: "source removed", gone_lut: "LUT removed"}
@@ -7,9 +7,15 @@ const nextBtn = document.getElementById("next");
 const backdropEl = document.getElementById("backdrop");
 
 let manifest = null;
-let activeList = [];
+let activeKey = "landscape";
+let activeCount = 0;
 let index = 0;
+let renderToken = 0;
 let autoplayTimer = null;
+const MANIFEST_URL = new URL("data/gallery.json", document.baseURI);
+const PREFETCH_AHEAD = 3;
+const shardCache = new Map();
+const prefetched = new Set();
 const AUTOPLAY_MS = 6500;
 const mq = window.matchMedia("(orientation: portrait)");
 let touchStartX = null;
@@ -52,12 +58,13 @@ slideshowEl.addEventListener("touchend", handleTouchEnd, { passive: true });
 
 async function init() {
   try {
-    const res = await fetch("data/gallery.json", { cache: "no-store" });
+    // The index is tiny and revalidated; shards are content-hashed and immutable.
+    const res = await fetch(MANIFEST_URL, { cache: "no-cache" });
     if (!res.ok) throw new Error(`HTTP ${res.status}`);
     manifest = await res.json();
     statusEl.textContent = "";
     selectOrientation();
-    render(true);
+    await render(true);
     startAutoplay();
   } catch (err) {
     statusEl.textContent = `Failed to load manifest: ${err.message}`;
@@ -66,22 +73,68 @@ async function init() {
 
 function selectOrientation() {
   if (!manifest) return;
-  const key = mq.matches ? "vertical" : "landscape";
-  activeList = manifest[key] || [];
-  index = Math.min(index, Math.max(activeList.length - 1, 0));
-  const modeLabel = key === "vertical" ? "portrait" : "landscape";
-  statusEl.textContent = `${activeList.length} photos — ${modeLabel} mode`;
+  activeKey = mq.matches ? "vertical" : "landscape";
+  const section = manifest[activeKey];
+  // Version 1 manifests inline every entry as an array.
+  activeCount = Array.isArray(section) ? section.length : section?.count || 0;
+  index = Math.min(index, Math.max(activeCount - 1, 0));
+  const modeLabel = activeKey === "vertical" ? "portrait" : "landscape";
+  statusEl.textContent = `${activeCount} photos — ${modeLabel} mode`;
+}
+
+function loadShard(key, page) {
+  const cacheKey = `${key}:${page}`;
+  if (!shardCache.has(cacheKey)) {
+    const section = manifest[key];
+    let pending;
+    if (Array.isArray(section)) {
+      pending = Promise.resolve(section);
+    } else {
+      const url = new URL(section.shards[page].path, MANIFEST_URL);
+      pending = fetch(url, { cache: "force-cache" }).then((res) => {
+        if (!res.ok) throw new Error(`HTTP ${res.status}`);
+        return res.json();
+      });
+      pending.catch(() => shardCache.delete(cacheKey));
+    }
+    shardCache.set(cacheKey, pending);
+  }
+  return shardCache.get(cacheKey);
+}
+
+async function entryAt(key, position) {
+  const section = manifest[key];
+  if (Array.isArray(section)) return section[position];
+  const pageSize = manifest.page_size;
+  const entries = await loadShard(key, Math.floor(position / pageSize));
+  return entries[position % pageSize];
+}
+
+function prefetchAhead() {
+  for (let step = 1; step <= Math.min(PREFETCH_AHEAD, activeCount - 1); step++) {
+    const position = (index + step) % activeCount;
+    entryAt(activeKey, position)
+      .then((entry) => {
+        if (!entry || prefetched.has(entry.path)) return;
+        prefetched.add(entry.path);
+        const img = new Image();
+        img.decoding = "async";
+        img.src = entry.path;
+      })
+      .catch(() => {});
+  }
 }
 
 function advance(delta) {
-  if (activeList.length === 0) return;
-  index = (index + delta + activeList.length) % activeList.length;
+  if (activeCount === 0) return;
+  index = (index + delta + activeCount) % activeCount;
   render();
 }
 
-function render(force = false) {
+async function render(force = false) {
   if (!manifest) return;
-  if (activeList.length === 0) {
+  const token = ++renderToken;
+  if (activeCount === 0) {
     slideshowEl.classList.add("hidden");
     captionEl.textContent = "";
     slideContainer.innerHTML = "";
@@ -89,14 +142,23 @@ function render(force = false) {
   }
   slideshowEl.classList.remove("hidden");
 
-  const current = activeList[index];
+  let current;
+  try {
+    current = await entryAt(activeKey, index);
+  } catch (err) {
+    statusEl.textContent = `Failed to load photos: ${err.message}`;
+    return;
+  }
+  // A newer navigation started while this shard was loading.
+  if (token !== renderToken || !current) return;
+
   const existing = slideContainer.querySelector(`[data-path="${current.path}"]`);
 
   if (force) {
     slideContainer.innerHTML = "";
   }
 
-  let incoming = existing;
+  let incoming = force ? null : existing;
   if (!incoming) {
     incoming = createSlide(current);
     slideContainer.appendChild(incoming);
@@ -120,7 +182,8 @@ function render(force = false) {
   }
 
   captionEl.textContent = `${current.source} · ${current.lut}`;
-  updateBackdrop(incoming.querySelector("img"));
+  updateBackdrop(incoming.querySelector("img"), current.color);
+  prefetchAhead();
 }
 
 function createSlide(entry) {
@@ -128,20 +191,38 @@ function createSlide(entry) {
   wrapper.className = "slide";
   wrapper.dataset.path = entry.path;
 
+  if (entry.placeholder || entry.color) {
+    // Grade-time placeholder paints immediately while the full image loads.
+    const placeholder = document.createElement("div");
+    placeholder.className = "placeholder";
+    if (entry.color) placeholder.style.backgroundColor = entry.color;
+    if (entry.placeholder) placeholder.style.backgroundImage = `url("${entry.placeholder}")`;
+    wrapper.appendChild(placeholder);
+  }
+
   const img = document.createElement("img");
+  img.decoding = "async";
+  img.addEventListener("load", () => img.classList.add("loaded"), { once: true });
   img.src = entry.path;
   img.alt = `${entry.source} — ${entry.lut}`;
+  if (img.complete) img.classList.add("loaded");
 
   wrapper.appendChild(img);
   return wrapper;
 }
 
-function updateBackdrop(img) {
-  if (!img || !backdropEl) return;
-  const average = dominantShadowColor(img);
+function updateBackdrop(img, color) {
+  if (!backdropEl) return;
+  if (!color && !img) return;
+  const average = color ? hexToShadow(color) : dominantShadowColor(img);
   backdropEl.style.background = `radial-gradient(circle at top, ${average}, transparent 60%), var(--backdrop-dark)`;
 }
 
+function hexToShadow(hex) {
+  const value = parseInt(hex.slice(1), 16);
+  return `rgba(${(value >> 16) & 255}, ${(value >> 8) & 255}, ${value & 255}, 0.35)`;
+}
+
 function dominantShadowColor(img) {
   try {
     const canvas = document.createElement("canvas");
@@ -168,7 +249,7 @@ function dominantShadowColor(img) {
 
 function startAutoplay() {
   stopAutoplay();
-  if (activeList.length <= 1) return;
+  if (activeCount <= 1) return;
   autoplayTimer = window.setInterval(() => advance(1), AUTOPLAY_MS);
 }
 